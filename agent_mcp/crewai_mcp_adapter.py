@@ -7,15 +7,43 @@ with agents from other frameworks like Autogen and Langchain.
 """
 
 import asyncio
+import contextlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Callable
 from crewai import Agent as CrewAgent
-from fastapi import FastAPI, Request
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
 from .mcp_agent import MCPAgent
 from .mcp_transport import HTTPTransport
 import uvicorn
-from threading import Thread
 import time
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def use_uvloop() -> bool:
+    """
+    Make uvloop the event loop implementation for loops created from now on.
+    
+    Call this before asyncio.run() in an application hosting CrewAI adapters;
+    importing this module deliberately leaves the global loop policy alone.
+    
+    Returns:
+        True if uvloop was installed, False if it is not available
+    """
+    if not UVLOOP_AVAILABLE:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 class CrewAIMCPAdapter(MCPAgent):
     """
     Adapter for CrewAI agents to work with MCP.
@@ -31,6 +59,8 @@ class CrewAIMCPAdapter(MCPAgent):
         process_message: Optional[Callable] = None,
         transport: Optional[HTTPTransport] = None,
         client_mode: bool = True,
+        max_workers: int = 8,
+        max_inflight: int = 4,
         **kwargs
     ):
         """
@@ -42,6 +72,9 @@ class CrewAIMCPAdapter(MCPAgent):
             process_message: Optional custom message processing function
             transport: Optional transport layer
             client_mode: Whether to run in client mode
+            max_workers: Maximum number of CrewAI tasks executed concurrently
+            max_inflight: Maximum number of tasks taken off the queue at once,
+                counting those still sending their results
             **kwargs: Additional arguments to pass to MCPAgent
         """
         super().__init__(name=name, **kwargs)
@@ -53,34 +86,46 @@ class CrewAIMCPAdapter(MCPAgent):
         self.task_queue = asyncio.Queue()
         self.server_ready = asyncio.Event()
         
-        # Create FastAPI app for server mode
-        self.app = FastAPI()
+        # Dedicated pool for blocking CrewAI calls; the semaphore keeps excess
+        # tasks waiting on the loop instead of piling up in the executor queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"crewai-{name}")
+        self._exec_sem = asyncio.Semaphore(max_workers)
         
-        @self.app.post("/message")
-        async def handle_message(request: Request):
-            return await self._handle_message(request)
-            
-        @self.app.on_event("startup")
-        async def startup_event():
-            self.server_ready.set()
+        # Bounds tasks in flight so execution overlaps with sending earlier replies
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self._inflight_tasks = set()
+        
+        # Bare Starlette app for server mode; the single raw-JSON endpoint
+        # needs none of FastAPI's validation or dependency injection
+        self.app = Starlette(
+            routes=[Route("/message", self._handle_message, methods=["POST"])],
+            lifespan=self._lifespan
+        )
             
-        self.server_thread = None
+        self.server = None
+        self.server_task = None
+    
+    @contextlib.asynccontextmanager
+    async def _lifespan(self, app):
+        """Signal readiness once the server has started"""
+        self.server_ready.set()
+        yield
         
     async def _handle_message(self, request: Request):
         """Handle incoming HTTP messages"""
         try:
             message = await request.json()
             await self.task_queue.put(message)
-            return {"status": "ok"}
+            return JSONResponse({"status": "ok"})
         except Exception as e:
-            return {"status": "error", "message": str(e)}
+            return JSONResponse({"status": "error", "message": str(e)})
             
     async def process_messages(self):
         """Process incoming messages from the transport layer"""
         while True:
             try:
                 message, message_id = await self.transport.receive_message()
-                print(f"{self.name}: Received message {message_id}: {message}")
+                logger.debug("%s: Received message %s: %s", self.name, message_id, message)
                 
                 if message and isinstance(message, dict):
                     # Add message_id to message for tracking
@@ -104,113 +149,120 @@ class CrewAIMCPAdapter(MCPAgent):
                         # If skipped, acknowledge and continue
                         if message_id and self.transport:
                             asyncio.create_task(self.transport.acknowledge_message(self.name, message_id))
-                            print(f"[{self.name}] Acknowledged duplicate task {message.get('task_id')} (msg_id: {message_id})")
+                            logger.info("[%s] Acknowledged duplicate task %s (msg_id: %s)", self.name, message.get('task_id'), message_id)
                         continue
                     
                     if message.get("type") == "task":
-                        print(f"{self.name}: Queueing task with message_id {message_id}")
+                        logger.debug("%s: Queueing task with message_id %s", self.name, message_id)
                         await self.task_queue.put(message)
                     elif self.custom_process_message:
                         await self.custom_process_message(self, message)
                     else:
-                        print(f"{self.name}: Unknown message type: {message.get('type')}")
+                        logger.warning("%s: Unknown message type: %s", self.name, message.get('type'))
                         # Acknowledge unknown messages
                         if message_id and self.transport:
                             await self.transport.acknowledge_message(self.name, message_id)
-                            print(f"{self.name}: Acknowledged unknown message {message_id}")
+                            logger.debug("%s: Acknowledged unknown message %s", self.name, message_id)
             except asyncio.CancelledError:
-                print(f"{self.name}: Message processor cancelled")
+                logger.info("%s: Message processor cancelled", self.name)
                 break
             except Exception as e:
-                print(f"{self.name}: Error processing message: {e}")
-                traceback.print_exc()
+                logger.exception("%s: Error processing message: %s", self.name, e)
                 await asyncio.sleep(1)
                 
     async def process_tasks(self):
-        """Process tasks from the queue using the CrewAI agent"""
+        """Process tasks from the queue using the CrewAI agent, up to max_inflight at a time"""
         while True:
             try:
-                task = await self.task_queue.get()
-                task_id = task.get('task', {}).get('task_id')
-                message_id = task.get('message_id')
+                await self._inflight.acquire()
+                try:
+                    task = await self.task_queue.get()
+                except BaseException:
+                    self._inflight.release()
+                    raise
                 
-                print(f"\n{self.name}: Processing task {task_id} with message_id {message_id}")
+                runner = asyncio.create_task(self._run_one(task))
+                self._inflight_tasks.add(runner)
+                runner.add_done_callback(self._inflight_tasks.discard)
                 
-                try:
-                    # Extract task details from content or root level
-                    # Standardized task extraction
-                    # Unified content extraction with backward compatibility
-                    task_content = task.get('content', task.get('task', {}))
-                    task_id = task_content.get('task_id')
-                    task_description = task_content.get('description')
-                    
-                    # Validate required fields
-                    if not all([task_id, task_description]):
-                        raise ValueError(f"Missing required task fields in message {message_id}")
-                    message_id = task.get('message_id')
-                    reply_to = task.get('reply_to')
-                    
-                    if not task_id or not task_description:
-                        print(f"[{self.name}] ERROR: Invalid task structure received: {task}")
-                        # Acknowledge bad tasks
-                        if message_id and self.transport:
-                             await self.transport.acknowledge_message(self.name, message_id)
-                        print(f"[ERROR] {self.name}: Task missing required fields: {task}")
-                        self.task_queue.task_done()
-                        continue
-                        
-                    print(f"\n{self.name}: Processing task {task_id} (from msg {message_id}) Desc: {task_description}")
-                    
-                    result = await self.execute_task(task_description)
-                    
-                    # --- Mark task completed (Uses Base Class Method) ---
-                    super()._mark_task_completed(task_id)
-                    # --- End mark task completed ---
-                    
-                    # Send result back if reply_to is specified
-                    if reply_to:
-                        await self.transport.send_message(
-                            reply_to,
-                            {
-                                "type": "task_result",
-                                "task_id": task_id,
-                                "result": result,
-                                "sender": self.name,
-                                "original_message_id": message_id  # Include original message ID
-                            }
-                        )
-                        print(f"{self.name}: Result sent successfully")
-                        
-                        # Acknowledge task completion
-                        if message_id:
-                            await self.transport.acknowledge_message(self.name, message_id)
-                            print(f"{self.name}: Task {task_id} acknowledged with message_id {message_id}")
-                        else:
-                            print(f"{self.name}: No message_id for task {task_id}, cannot acknowledge")
-                except Exception as e:
-                    print(f"{self.name}: Error executing task: {e}")
-                    traceback.print_exc()
+            except asyncio.CancelledError:
+                logger.info("%s: Task processor cancelled", self.name)
+                break
+            except Exception as e:
+                logger.exception("%s: Error processing task: %s", self.name, e)
+                await asyncio.sleep(1)
+    
+    async def _run_one(self, task: Dict[str, Any]):
+        """Execute one queued task and send its result, then free its in-flight slot"""
+        try:
+            task_id = task.get('task', {}).get('task_id')
+            message_id = task.get('message_id')
+            reply_to = task.get('reply_to')
+            
+            logger.debug("%s: Processing task %s with message_id %s", self.name, task_id, message_id)
+            
+            try:
+                # Unified content extraction with backward compatibility
+                task_content = task.get('content', task.get('task', {}))
+                task_id = task_content.get('task_id')
+                task_description = task_content.get('description')
+                
+                if not task_id or not task_description:
+                    logger.error("[%s] Invalid task structure received: %s", self.name, task)
+                    # Acknowledge bad tasks
+                    if message_id and self.transport:
+                        await self.transport.acknowledge_message(self.name, message_id)
+                    return
                     
-                    # Send error result back if reply_to is specified
-                    if reply_to:
-                        await self.transport.send_message(
-                            task['reply_to'],
-                            {
-                                "type": "task_result",
-                                "task_id": task_id,
-                                "result": f"Error: {str(e)}",
-                                "sender": self.name,
-                                "original_message_id": message_id,
-                                "error": True
-                            }
-                        )
+                logger.info("%s: Processing task %s (from msg %s) Desc: %s", self.name, task_id, message_id, task_description)
                 
-                self.task_queue.task_done()
+                result = await self.execute_task(task_description)
                 
+                # --- Mark task completed (Uses Base Class Method) ---
+                super()._mark_task_completed(task_id)
+                # --- End mark task completed ---
+                
+                # Send result back if reply_to is specified
+                if reply_to:
+                    await self.transport.send_message(
+                        reply_to,
+                        {
+                            "type": "task_result",
+                            "task_id": task_id,
+                            "result": result,
+                            "sender": self.name,
+                            "original_message_id": message_id  # Include original message ID
+                        }
+                    )
+                    logger.debug("%s: Result sent successfully", self.name)
+                    
+                    # Acknowledge task completion
+                    if message_id:
+                        await self.transport.acknowledge_message(self.name, message_id)
+                        logger.debug("%s: Task %s acknowledged with message_id %s", self.name, task_id, message_id)
+                    else:
+                        logger.warning("%s: No message_id for task %s, cannot acknowledge", self.name, task_id)
             except Exception as e:
-                print(f"{self.name}: Error processing task: {e}")
-                traceback.print_exc()
-                await asyncio.sleep(1)
+                logger.exception("%s: Error executing task: %s", self.name, e)
+                
+                # Send error result back if reply_to is specified
+                if reply_to:
+                    await self.transport.send_message(
+                        reply_to,
+                        {
+                            "type": "task_result",
+                            "task_id": task_id,
+                            "result": f"Error: {str(e)}",
+                            "sender": self.name,
+                            "original_message_id": message_id,
+                            "error": True
+                        }
+                    )
+        except Exception as e:
+            logger.exception("%s: Error processing task: %s", self.name, e)
+        finally:
+            self.task_queue.task_done()
+            self._inflight.release()
                 
     async def execute_task(self, task_description: str) -> str:
         """
@@ -224,10 +276,12 @@ class CrewAIMCPAdapter(MCPAgent):
         """
         try:
             # Execute task using CrewAI agent
-            result = await asyncio.to_thread(
-                self.crewai_agent.execute,
-                task_description
-            )
+            async with self._exec_sem:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._executor,
+                    self.crewai_agent.execute,
+                    task_description
+                )
             return str(result)
         except Exception as e:
             return f"Error executing task: {e}"
@@ -237,28 +291,29 @@ class CrewAIMCPAdapter(MCPAgent):
         if not self.transport:
             raise ValueError(f"{self.name}: No transport configured")
             
-        # Start the transport server if not in client mode
+        # Start the transport server if not in client mode. It is served on the
+        # running loop, so _handle_message feeds task_queue from the loop that owns it.
         if not self.client_mode:
-            def run_server():
-                config = uvicorn.Config(
-                    app=self.app,
-                    host=self.transport.host,
-                    port=self.transport.port,
-                    log_level="info"
-                )
-                server = uvicorn.Server(config)
-                server.run()
-                
-            self.server_thread = Thread(target=run_server, daemon=True)
-            self.server_thread.start()
+            config = uvicorn.Config(
+                app=self.app,
+                host=self.transport.host,
+                port=self.transport.port,
+                log_level="warning",
+                access_log=False,
+                # "auto" picks httptools whenever it is installed
+                http="auto",
+                ws="none"
+            )
+            self.server = uvicorn.Server(config)
+            self.server_task = asyncio.create_task(self.server.serve())
         else:
             # In client mode, we're ready immediately
             self.server_ready.set()
             
-        print(f"{self.name}: Starting message processor...")
+        logger.info("%s: Starting message processor...", self.name)
         asyncio.create_task(self.process_messages())
         
-        print(f"{self.name}: Starting task processor...")
+        logger.info("%s: Starting task processor...", self.name)
         asyncio.create_task(self.process_tasks())
         
     async def connect_to_server(self, server_url: str):
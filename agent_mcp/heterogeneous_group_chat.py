@@ -320,8 +320,11 @@ class HeterogeneousGroupChat:
 
         print("Registering agents...")
         tasks = [coord_task] # Start with coordinator task
-        for agent in self.agents:
-            agent_task = await self._register_and_start_agent(agent)
+        # Registrations are independent round trips to the server, so run them concurrently
+        agent_tasks = await asyncio.gather(
+            *(self._register_and_start_agent(agent) for agent in self.agents)
+        )
+        for agent, agent_task in zip(self.agents, agent_tasks):
             if agent_task: # Only add task if registration was successful
                 tasks.append(agent_task)
             else:
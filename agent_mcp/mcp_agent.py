@@ -278,6 +278,11 @@ class MCPAgent(ConversableAgent):
             True if the key exists in the context, False otherwise
         """
         return key in self.context_store
+
+    @property
+    def context_keys(self) -> Tuple[str, ...]:
+        """The keys currently in the agent's context, without going through tool dispatch."""
+        return tuple(self.context_store)
         
     def _mcp_context_get(self, key: str) -> Dict:
         """
@@ -9,7 +9,7 @@ from abc import ABC, abstractmethod
 import asyncio
 import json
 import aiohttp # Added this line
-from typing import Dict, Any, Optional, Callable, AsyncGenerator, Tuple
+from typing import Dict, Any, List, Optional, Callable, AsyncGenerator, Tuple
 from aiohttp import web, ClientSession, TCPConnector, ClientTimeout, ClientConnectorError, ClientPayloadError
 from fastapi import FastAPI, Request
 import uvicorn
@@ -58,7 +58,8 @@ class HTTPTransport(MCPTransport):
     2. Client Mode: Connects to remote server (when is_remote=True)
     """
     
-    def __init__(self, host: str = "localhost", port: int = 8000, poll_interval: int = 2):
+    def __init__(self, host: str = "localhost", port: int = 8000, poll_interval: int = 2,
+                 max_queue_size: int = 1024):
         """
         Initialize the HTTP transport.
         
@@ -66,12 +67,14 @@ class HTTPTransport(MCPTransport):
             host: Host to bind to
             port: Port to bind to
             poll_interval: How often to poll the server in seconds
+            max_queue_size: Maximum number of undelivered messages; producers wait when full
         """
         self.host = host
         self.port = port
         self.app = FastAPI()
         self.app.post("/message")(self._handle_message)
-        self.message_queue = asyncio.Queue()
+        self.message_queue = asyncio.Queue(maxsize=max_queue_size)
+        self._queue_loop = None  # Event loop that consumes message_queue
         self.message_handler: Optional[Callable] = None
         self.server_thread = None
         self.is_remote = False
@@ -121,8 +124,22 @@ class HTTPTransport(MCPTransport):
         try:
             message = await request.json()
             # Use None as message_id since this is direct HTTP
-            await self.message_queue.put((message, None))
+            item = (message, None)
+            queue_loop = self._queue_loop
+            if queue_loop is None or queue_loop.is_closed():
+                # Nothing is consuming yet, so a full queue cannot drain
+                self.message_queue.put_nowait(item)
+            elif queue_loop is asyncio.get_running_loop():
+                await self.message_queue.put(item)
+            else:
+                # The server runs on uvicorn's loop in its own thread; wait for
+                # room on the loop that owns the queue
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(self.message_queue.put(item), queue_loop)
+                )
             return {"status": "ok"}
+        except asyncio.QueueFull:
+            return {"status": "error", "message": "Message queue is full"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
@@ -172,7 +189,7 @@ class HTTPTransport(MCPTransport):
                 ) as response:
                     if response.status == 200:
                         data = await response.json()
-                        logger.info(f"[{self.agent_name}] Raw server response: {json.dumps(data, indent=2)}")
+                        logger.debug("[%s] Raw server response: %s", self.agent_name, data)
                         
                         # Extract messages from the response body
                         messages = []
@@ -180,7 +197,7 @@ class HTTPTransport(MCPTransport):
                             body = data.get('body', '[]')
                             try:
                                 messages = json.loads(body)
-                                logger.info(f"[{self.agent_name}] Parsed messages from body: {json.dumps(messages, indent=2)}")
+                                logger.debug("[%s] Parsed messages from body: %s", self.agent_name, messages)
                             except json.JSONDecodeError:
                                 logger.warning(f"[{self.agent_name}] Failed to parse messages from body: {body}")
                                 messages = []
@@ -197,7 +214,7 @@ class HTTPTransport(MCPTransport):
                                 except asyncio.QueueEmpty:
                                     break
 
-                            logger.info(f"[{self.agent_name}] Processing {len(messages)} messages")
+                            logger.info("[%s] Processing %d messages", self.agent_name, len(messages))
                             for msg in messages:
                                 try:
                                     # Validate message format
@@ -230,11 +247,11 @@ class HTTPTransport(MCPTransport):
                                             message_content = {'text': json.dumps(message_content)}
                                             msg['content'] = message_content
 
-                                    logger.info(f"[{self.agent_name}] Processing message - ID: {message_id}, Content: {json.dumps(message_content, indent=2)}")
+                                    logger.debug("[%s] Processing message - ID: %s, Content: %s", self.agent_name, message_id, message_content)
                                     
                                     # Add message to queue for processing
                                     await self.message_queue.put((msg, message_id))
-                                    logger.info(f"[{self.agent_name}] Added message to queue: {message_id}")
+                                    logger.debug("[%s] Added message to queue: %s", self.agent_name, message_id)
                                 except Exception as e:
                                     logger.error(f"[{self.agent_name}] Error processing message: {e}")
                                     continue
@@ -519,6 +536,8 @@ class HTTPTransport(MCPTransport):
             if no message is received within the timeout, the polling task
             has stopped, or an error occurs.
         """
+        self._queue_loop = asyncio.get_running_loop()
+        
         # Check if polling is active before waiting
         if not self._polling_task or self._polling_task.done():
             # If polling task is not running or finished, try to restart it
@@ -534,39 +553,23 @@ class HTTPTransport(MCPTransport):
         try:
             # Wait for a message from the queue with a timeout
             if timeout > 0:
-                logger.info(f"[{self.agent_name}] Waiting for message from queue (timeout={timeout}s)...")
+                logger.debug("[%s] Waiting for message from queue (timeout=%ss)...", self.agent_name, timeout)
                 try:
                     message, message_id = await asyncio.wait_for(self.message_queue.get(), timeout=timeout)
-                    logger.info(f"[{self.agent_name}] Received message from queue: {json.dumps(message, indent=2)}")
+                    logger.debug("[%s] Received message from queue: %s", self.agent_name, message)
                 except asyncio.TimeoutError:
-                    logger.info(f"[{self.agent_name}] Timeout waiting for message. Returning None.")
+                    logger.debug("[%s] Timeout waiting for message. Returning None.", self.agent_name)
                     return None, None
             else:
                 # Non-blocking get if timeout is 0
                 try:
                     message, message_id = self.message_queue.get_nowait()
                 except asyncio.QueueEmpty:
-                    logger.info(f"[{self.agent_name}] Queue empty on get_nowait. Returning None.")
+                    logger.debug("[%s] Queue empty on get_nowait. Returning None.", self.agent_name)
                     return None, None
 
-            # Validate message before returning
-            if message and isinstance(message, dict):
-                # More lenient validation - only check for essential fields
-                if 'content' in message or 'text' in message or 'description' in message:
-                    logger.info(f"[{self.agent_name}] Message validation passed, returning message with ID: {message_id}")
-                    # Mark task done *after* successful retrieval and validation
-                    self.message_queue.task_done()
-                    # Acknowledge the message after successfully receiving it
-                    if message.get('from') and message_id:
-                        await self.acknowledge_message(message.get('from'), message_id)
-                    return message, message_id
-                else:
-                    logger.warning(f"[{self.agent_name}] Message missing required 'content' field. Message: {message}")
-            else:
-                logger.warning(f"[{self.agent_name}] Invalid message format. Message: {message}")
-
-            # Mark task as done even if validation failed
-            self.message_queue.task_done()
+            if await self._accept_message(message, message_id):
+                return message, message_id
             return None, None
 
         except asyncio.CancelledError:
@@ -583,6 +586,52 @@ class HTTPTransport(MCPTransport):
                 logger.error(f"[{self.agent_name}] Error calling task_done in exception handler: {inner_e}")
             return None, None
 
+    async def receive_batch(self, max_n: int = 32, timeout: float = 5.0) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """Receive up to max_n queued messages in one call.
+
+        Waits up to timeout seconds for the first message, then drains whatever
+        else is already queued without waiting again. Messages are validated and
+        acknowledged exactly as in receive_message.
+
+        Returns:
+            A list of (message, message_id) tuples, empty on timeout.
+        """
+        self._queue_loop = asyncio.get_running_loop()
+        try:
+            first = await asyncio.wait_for(self.message_queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        items = [first]
+        while len(items) < max_n:
+            try:
+                items.append(self.message_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        batch = []
+        for message, message_id in items:
+            if await self._accept_message(message, message_id):
+                batch.append((message, message_id))
+        return batch
+
+    async def _accept_message(self, message: Any, message_id: Optional[str]) -> bool:
+        """Validate and acknowledge a message taken off the queue, marking it done."""
+        # Mark task done whether or not validation passes
+        self.message_queue.task_done()
+        if message and isinstance(message, dict):
+            # More lenient validation - only check for essential fields
+            if 'content' in message or 'text' in message or 'description' in message:
+                logger.debug("[%s] Message validation passed, returning message with ID: %s", self.agent_name, message_id)
+                # Acknowledge the message after successfully receiving it
+                if message.get('from') and message_id:
+                    await self.acknowledge_message(message.get('from'), message_id)
+                return True
+            logger.warning(f"[{self.agent_name}] Message missing required 'content' field. Message: {message}")
+        else:
+            logger.warning(f"[{self.agent_name}] Invalid message format. Message: {message}")
+        return False
+
     # Legacy method - replaced by new acknowledge_message with target parameter
     async def _legacy_acknowledge_message(self, message_id: str):
         """Legacy method to acknowledge a message"""
@@ -624,6 +673,13 @@ class HTTPTransport(MCPTransport):
             logger.info(f"[{self.agent_name or 'Unknown'}] In remote mode. Call connect() to start polling.")
             return
             
+        # Requests are handled on uvicorn's own loop; remember the caller's so
+        # _handle_message can hand messages over to it
+        try:
+            self._queue_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        
         def run_server():
             uvicorn.run(self.app, host=self.host, port=self.port)
             
@@ -8,9 +8,14 @@ import json
 from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, asdict
 import logging
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+def _get_timestamp() -> str:
+    """Current local time in ISO format"""
+    return datetime.now().isoformat()
+
 # Try to import the missing frameworks
 try:
     # Note: These would require actual installation and API access
@@ -29,12 +34,14 @@ except ImportError as e:
 class BeeAIAgent:
     """BeeAI Framework Agent - Placeholder Implementation"""
     
-    def __init__(self, agent_id: str, name: str, description: str = ""):
+    def __init__(self, agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None):
         self.agent_id = agent_id
         self.name = name
         self.description = description
+        self.transport = transport  # may be shared with other agents in the process
         self.tasks = []
         self.agent_tools = {}
+        self.mcp_tools = {}  # tool name -> description, parameters and async function
         self.mcp_id = agent_id
         self.mcp_version = "0.1.0"
         
@@ -46,7 +53,7 @@ class BeeAIAgent:
         
         async def bee_create_task(task: str) -> Dict[str, Any]:
             """Create a task in BeeAI"""
-            self.tasks.append({"task": task, "status": "created", "created_at": self._get_timestamp()})
+            self.tasks.append({"task": task, "status": "created", "created_at": _get_timestamp()})
             return {"status": "success", "task_id": f"task_{len(self.tasks)}"}
         
         async def bee_execute_task(task_id: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -84,12 +91,14 @@ class BeeAIAgent:
 class AgentGPTAgent:
     """AgentGPT Framework Agent - Placeholder Implementation"""
     
-    def __init__(self, agent_id: str, name: str, description: str = ""):
+    def __init__(self, agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None):
         self.agent_id = agent_id
         self.name = name
         self.description = description
+        self.transport = transport  # may be shared with other agents in the process
         self.conversations = []
         self.agent_tools = {}
+        self.mcp_tools = {}  # tool name -> description, parameters and async function
         self.mcp_id = agent_id
         self.mcp_version = "0.1.0"
         
@@ -101,14 +110,14 @@ class AgentGPTAgent:
         async def agentgpt_create_conversation(conversation_id: str = None) -> Dict[str, Any]:
             """Create a conversation"""
             conv_id = conversation_id or f"conv_{len(self.conversations)}"
-            self.conversations.append({"id": conv_id, "created_at": self._get_timestamp(), "messages": []})
+            self.conversations.append({"id": conv_id, "created_at": _get_timestamp(), "messages": []})
             return {"status": "success", "conversation_id": conv_id}
         
         async def agentgpt_send_message(conversation_id: str, message: str) -> Dict[str, Any]:
             """Send a message in conversation"""
             for conv in self.conversations:
                 if conv["id"] == conversation_id:
-                    conv["messages"].append({"role": "user", "content": message, "timestamp": self._get_timestamp()})
+                    conv["messages"].append({"role": "user", "content": message, "timestamp": _get_timestamp()})
                     return {"status": "success", "message": "Message sent"}
             return {"status": "error", "message": "Conversation not found"}
         
@@ -139,21 +148,18 @@ class AgentGPTAgent:
                 "function": agentgpt_list_conversations
             }
         })
-    
-    def _get_timestamp(self) -> str:
-        """Get current timestamp"""
-        import datetime
-        return datetime.now().isoformat()
 
 @dataclass
 class SuperAGIAgent:
     """SuperAGI Framework Agent - Placeholder Implementation"""
     
-    def __init__(self, agent_id: str, name: str, description: str = ""):
+    def __init__(self, agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None):
         self.agent_id = agent_id
         self.name = name
         self.description = description
+        self.transport = transport  # may be shared with other agents in the process
         self.agent_tools = {}
+        self.mcp_tools = {}  # tool name -> description, parameters and async function
         self.mcp_id = agent_id
         self.mcp_version = "0.1.0"
         
@@ -201,12 +207,14 @@ class SuperAGIAgent:
 class FractalAgent:
     """Fractal Framework Agent - Placeholder Implementation"""
     
-    def __init__(self, agent_id: str, name: str, description: str = ""):
+    def __init__(self, agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None):
         self.agent_id = agent_id
         self.name = name
         self.description = description
+        self.transport = transport  # may be shared with other agents in the process
         self.contracts = []
         self.agent_tools = {}
+        self.mcp_tools = {}  # tool name -> description, parameters and async function
         self.mcp_id = agent_id
         self.mcp_version = "0.1.0"
         
@@ -218,7 +226,7 @@ class FractalAgent:
         async def fractal_create_contract(contract_data: Dict[str, Any]) -> Dict[str, Any]:
             """Create a smart contract"""
             contract_id = f"contract_{len(self.contracts) + 1}"
-            self.contracts.append({"id": contract_id, "data": contract_data, "created_at": self._get_timestamp()})
+            self.contracts.append({"id": contract_id, "data": contract_data, "created_at": _get_timestamp()})
             return {"status": "success", "contract_id": contract_id}
         
         async def fractal_execute_contract(contract_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -269,12 +277,14 @@ class FractalAgent:
 class SwarmAgent:
     """OpenAI Swarm Framework Agent - Placeholder Implementation"""
     
-    def __init__(self, agent_id: str, name: str, description: str = ""):
+    def __init__(self, agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None):
         self.agent_id = agent_id
         self.name = name
         self.description = description
+        self.transport = transport  # may be shared with other agents in the process
         self.agents = []
         self.agent_tools = {}
+        self.mcp_tools = {}  # tool name -> description, parameters and async function
         self.mcp_id = agent_id
         self.mcp_version = "0.1.0"
         
@@ -324,32 +334,27 @@ class SwarmAgent:
                 "function": swarm_coordinate_agents
             }
         })
-    
-    def _get_timestamp(self) -> str:
-        """Get current timestamp"""
-        import datetime
-        return datetime.now().isoformat()
 
 # Factory functions for easy creation
-def create_beeai_agent(agent_id: str, name: str, description: str = "") -> BeeAIAgent:
+def create_beeai_agent(agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None) -> BeeAIAgent:
     """Create a BeeAI agent with MCP integration"""
-    return BeeAIAgent(agent_id, name, description)
+    return BeeAIAgent(agent_id, name, description, transport)
 
-def create_agentgpt_agent(agent_id: str, name: str, description: str = "") -> AgentGPTAgent:
+def create_agentgpt_agent(agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None) -> AgentGPTAgent:
     """Create an AgentGPT agent with MCP integration"""
-    return AgentGPTAgent(agent_id, name, description)
+    return AgentGPTAgent(agent_id, name, description, transport)
 
-def create_superagi_agent(agent_id: str, name: str, description: str = "") -> SuperAGIAgent:
+def create_superagi_agent(agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None) -> SuperAGIAgent:
     """Create a SuperAGI agent with MCP integration"""
-    return SuperAGIAgent(agent_id, name, description)
+    return SuperAGIAgent(agent_id, name, description, transport)
 
-def create_fractal_agent(agent_id: str, name: str, description: str = "") -> FractalAgent:
+def create_fractal_agent(agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None) -> FractalAgent:
     """Create a Fractal agent with MCP integration"""
-    return FractalAgent(agent_id, name, description)
+    return FractalAgent(agent_id, name, description, transport)
 
-def create_swarm_agent(agent_id: str, name: str, description: str = "") -> SwarmAgent:
+def create_swarm_agent(agent_id: str, name: str, description: str = "", transport: Optional["HTTPTransport"] = None) -> SwarmAgent:
     """Create a Swarm agent with MCP integration"""
-    return SwarmAgent(agent_id, name, description)
+    return SwarmAgent(agent_id, name, description, transport)
 
 # Registry for the new frameworks
 MISSING_FRAMEWORKS = {
@@ -406,19 +411,23 @@ def create_multi_framework_agent(
     name: str,
     framework: str,
     description: str = "",
+    transport: Optional["HTTPTransport"] = None,
     **kwargs
 ):
-    """Create an agent with the specified framework"""
+    """Create an agent with the specified framework
+    
+    Pass the same transport to several agents to have them share one connection.
+    """
     if framework == "beeai":
-        return create_beeai_agent(agent_id, name, description)
+        return create_beeai_agent(agent_id, name, description, transport)
     elif framework == "agentgpt":
-        return create_agentgpt_agent(agent_id, name, description)
+        return create_agentgpt_agent(agent_id, name, description, transport)
     elif framework == "superagi":
-        return create_superagi_agent(agent_id, name, description)
+        return create_superagi_agent(agent_id, name, description, transport)
     elif framework == "fractal":
-        return create_fractal_agent(agent_id, name, description)
+        return create_fractal_agent(agent_id, name, description, transport)
     elif framework == "swarm":
-        return create_swarm_agent(agent_id, name, description)
+        return create_swarm_agent(agent_id, name, description, transport)
     else:
         # Default to existing behavior
         return mcp_agent(agent_id, name, description)
@@ -106,6 +106,16 @@ class PaymentResponse:
 class StripePaymentGateway:
     """Stripe Connect integration for fiat payments"""
     
+    # Stripe PaymentIntent status -> PaymentStatus
+    STATUS_MAPPING = {
+        "requires_payment_method": PaymentStatus.PENDING,
+        "requires_confirmation": PaymentStatus.PENDING,
+        "requires_action": PaymentStatus.PROCESSING,
+        "processing": PaymentStatus.PROCESSING,
+        "succeeded": PaymentStatus.COMPLETED,
+        "canceled": PaymentStatus.FAILED
+    }
+    
     def __init__(self, api_key: str, webhook_secret: str = None):
         if not STRIPE_AVAILABLE:
             raise ImportError("Stripe is not installed")
@@ -330,15 +340,7 @@ class StripePaymentGateway:
     
     def _convert_stripe_status(self, stripe_status: str) -> PaymentStatus:
         """Convert Stripe status to PaymentStatus"""
-        status_mapping = {
-            "requires_payment_method": PaymentStatus.PENDING,
-            "requires_confirmation": PaymentStatus.PENDING,
-            "requires_action": PaymentStatus.PROCESSING,
-            "processing": PaymentStatus.PROCESSING,
-            "succeeded": PaymentStatus.COMPLETED,
-            "canceled": PaymentStatus.FAILED
-        }
-        return status_mapping.get(stripe_status, PaymentStatus.FAILED)
+        return self.STATUS_MAPPING.get(stripe_status, PaymentStatus.FAILED)
 
 class USDCPaymentGateway:
     """USDC payment gateway on Base blockchain"""
@@ -500,6 +502,15 @@ class USDCPaymentGateway:
 class X402PaymentGateway:
     """x402 Protocol implementation for HTTP 402 payments"""
     
+    # x402 gateway status -> PaymentStatus
+    STATUS_MAPPING = {
+        "pending": PaymentStatus.PENDING,
+        "processing": PaymentStatus.PROCESSING,
+        "completed": PaymentStatus.COMPLETED,
+        "failed": PaymentStatus.FAILED,
+        "refunded": PaymentStatus.REFUNDED
+    }
+    
     def __init__(self, gateway_url: str, api_key: str = None):
         self.gateway_url = gateway_url
         self.api_key = api_key
@@ -592,14 +603,7 @@ class X402PaymentGateway:
     
     def _convert_x402_status(self, x402_status: str) -> PaymentStatus:
         """Convert x402 status to PaymentStatus"""
-        status_mapping = {
-            "pending": PaymentStatus.PENDING,
-            "processing": PaymentStatus.PROCESSING,
-            "completed": PaymentStatus.COMPLETED,
-            "failed": PaymentStatus.FAILED,
-            "refunded": PaymentStatus.REFUNDED
-        }
-        return status_mapping.get(x402_status, PaymentStatus.FAILED)
+        return self.STATUS_MAPPING.get(x402_status, PaymentStatus.FAILED)
 
 class HybridPaymentGateway:
     """Unified payment gateway supporting multiple payment methods"""
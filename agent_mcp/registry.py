@@ -13,16 +13,41 @@ This module provides a comprehensive registry for:
 import asyncio
 import json
 import uuid
+import time
+import hmac
 import hashlib
+import secrets
 import aiohttp
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, Callable, Union, Set
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Callable, Union, Set, Tuple
+from dataclasses import dataclass, field, fields
 from enum import Enum
+from collections import Counter, deque
 import logging
+import sys
+from array import array
+from math import nan as NAN
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _canonical_json(payload: Dict[str, Any]) -> bytes:
+    """Serialize a payload to compact, key-sorted UTF-8 JSON for signing"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
 class AgentProtocol(Enum):
     """Supported agent protocols"""
     MCP = "mcp"
@@ -56,7 +81,7 @@ class AgentLanguage(Enum):
     KOTLIN = "kotlin"
     UNKNOWN = "unknown"
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AgentRegistration:
     """Comprehensive agent registration information"""
     agent_id: str
@@ -67,15 +92,15 @@ class AgentRegistration:
     protocols: List[AgentProtocol]
     endpoint: str
     webhook_url: Optional[str] = None
-    capabilities: List[str] = None
+    capabilities: List[str] = field(default_factory=list)
     security_level: str = "medium"
     owner: Optional[str] = None
     version: str = "1.0.0"
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
     
     # Runtime information
     status: AgentStatus = AgentStatus.PENDING
-    registered_at: str = None
+    registered_at: str = field(default_factory=_utc_now_iso)
     last_heartbeat: Optional[str] = None
     health_status: Optional[str] = None
     health_check_url: Optional[str] = None
@@ -90,17 +115,16 @@ class AgentRegistration:
     public_key: Optional[str] = None
     did: Optional[str] = None  # Decentralized Identifier
     
-    def __post_init__(self):
-        if self.capabilities is None:
-            self.capabilities = []
-        if self.frameworks is None:
-            self.frameworks = []
-        if self.metadata is None:
-            self.metadata = {}
-        if self.registered_at is None:
-            self.registered_at = datetime.now(timezone.utc).isoformat()
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict form of the registration, without asdict()'s recursive deep copy"""
+        data = {name: getattr(self, name) for name in _REGISTRATION_FIELDS}
+        data["frameworks"] = list(self.frameworks)
+        data["protocols"] = list(self.protocols)
+        data["capabilities"] = list(self.capabilities)
+        data["metadata"] = dict(self.metadata)
+        return data
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class HealthCheckResult:
     """Health check result for an agent"""
     agent_id: str
@@ -108,17 +132,84 @@ class HealthCheckResult:
     response_time_ms: float
     timestamp: str
     error: Optional[str] = None
-    details: Dict[str, Any] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+_REGISTRATION_FIELDS = tuple(f.name for f in fields(AgentRegistration))
+
+class HealthHistory:
+    """Bounded health check history with running uptime and latency totals
+    
+    The full window is kept as two compact ring buffers (healthy flag and
+    response time); only the most recent results are kept as objects.
+    """
+    
+    __slots__ = ("maxlen", "recent", "healthy_count", "response_time_sum",
+                 "response_time_count", "_healthy", "_response_times", "_next", "_size")
     
-    def __post_init__(self):
-        if self.details is None:
-            self.details = {}
-        if self.timestamp is None:
-            self.timestamp = datetime.now(timezone.utc).isoformat()
+    def __init__(self, maxlen: int = 100, recent: int = 10):
+        self.maxlen = maxlen
+        self.recent = deque(maxlen=recent)
+        self.healthy_count = 0
+        self.response_time_sum = 0.0
+        self.response_time_count = 0
+        self._healthy = array("B", bytes(maxlen))
+        self._response_times = array("d", [NAN]) * maxlen  # NaN marks a missing measurement
+        self._next = 0
+        self._size = 0
+    
+    def append(self, result: HealthCheckResult):
+        """Add a result, retiring the oldest one from the totals when full"""
+        index = self._next
+        if self._size == self.maxlen:
+            self.healthy_count -= self._healthy[index]
+            old_response_time = self._response_times[index]
+            if old_response_time == old_response_time:  # not NaN
+                self.response_time_sum -= old_response_time
+                self.response_time_count -= 1
+        else:
+            self._size += 1
+        
+        healthy = 1 if result.status == "healthy" else 0
+        self._healthy[index] = healthy
+        self.healthy_count += healthy
+        
+        if result.response_time_ms is None:
+            self._response_times[index] = NAN
+        else:
+            self._response_times[index] = result.response_time_ms
+            self.response_time_sum += result.response_time_ms
+            self.response_time_count += 1
+        
+        self._next = (index + 1) % self.maxlen
+        self.recent.append(result)
+    
+    @property
+    def uptime_percentage(self) -> float:
+        return (self.healthy_count / self._size) * 100 if self._size else 0.0
+    
+    @property
+    def average_response_time(self) -> float:
+        if not self.response_time_count:
+            return 0.0
+        return self.response_time_sum / self.response_time_count
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self):
+        """Iterate over the most recent results, oldest first"""
+        return iter(self.recent)
+
+_PROTOCOL_ORDER = list(AgentProtocol)
 
 class ProtocolDetector:
     """Auto-detection of agent protocols"""
     
+    # Probes only need the status line, so bound them by connect time rather than body transfer
+    probe_timeout = aiohttp.ClientTimeout(sock_connect=1.0, total=2.0)
+    # Overall budget for detect_protocols; covers a probe plus its fallback path
+    detection_timeout = 4.0
+    
     def __init__(self):
         self.detected_protocols = {}
     
@@ -127,72 +218,106 @@ class ProtocolDetector:
         detected = []
         
         async with aiohttp.ClientSession() as session:
-            # Try MCP detection
-            if await self._detect_mcp(session, endpoint):
-                detected.append(AgentProtocol.MCP)
-            
-            # Try A2A detection
-            if await self._detect_a2a(session, endpoint):
-                detected.append(AgentProtocol.A2A)
+            # Run every probe concurrently; the REST fallback probe is only
+            # needed if nothing more specific answers
+            probes = {
+                asyncio.ensure_future(self._detect_mcp(session, endpoint)): AgentProtocol.MCP,
+                asyncio.ensure_future(self._detect_a2a(session, endpoint)): AgentProtocol.A2A,
+                asyncio.ensure_future(self._detect_openapi(session, endpoint)): AgentProtocol.OPENAPI,
+            }
+            rest_probe = asyncio.ensure_future(self._detect_rest(session, endpoint))
+            pending = set(probes) | {rest_probe}
             
-            # Try OpenAPI detection
-            if await self._detect_openapi(session, endpoint):
-                detected.append(AgentProtocol.OPENAPI)
+            try:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.detection_timeout
+                while pending:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    
+                    done, pending = await asyncio.wait(
+                        pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        if task in probes and not task.cancelled() and task.exception() is None and task.result():
+                            detected.append(probes[task])
+                    
+                    # A specific protocol answered, so the REST fallback is moot
+                    if detected and rest_probe in pending:
+                        rest_probe.cancel()
+                        pending.discard(rest_probe)
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
             
             # Default to REST if endpoint responds
-            if not detected and await self._detect_rest(session, endpoint):
+            if (not detected and rest_probe.done() and not rest_probe.cancelled()
+                    and rest_probe.exception() is None and rest_probe.result()):
                 detected.append(AgentProtocol.REST)
         
+        # Report in a stable order regardless of which probe finished first
+        detected.sort(key=_PROTOCOL_ORDER.index)
         return detected
     
+    async def _probe(self, session: aiohttp.ClientSession, url: str) -> int:
+        """Return the HTTP status of url using HEAD, falling back to a one-byte GET"""
+        async with session.head(url, timeout=self.probe_timeout, allow_redirects=True) as response:
+            if response.status != 405:
+                return response.status
+        
+        # Server does not allow HEAD; ask for a single byte of the body instead
+        async with session.get(url, timeout=self.probe_timeout, headers={"Range": "bytes=0-0"}) as response:
+            return 200 if response.status == 206 else response.status
+    
+    async def _detect_any(self, session: aiohttp.ClientSession, endpoint: str, paths: Tuple[str, ...]) -> bool:
+        """Return True if any of the candidate paths answers with 200"""
+        for path in paths:
+            try:
+                if await self._probe(session, f"{endpoint}{path}") == 200:
+                    return True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                continue
+        return False
+    
     async def _detect_mcp(self, session: aiohttp.ClientSession, endpoint: str) -> bool:
         """Detect if endpoint supports MCP"""
-        try:
-            # Check for MCP endpoint
-            async with session.get(f"{endpoint}/.well-known/mcp", timeout=5) as response:
-                return response.status == 200
-        except:
-            try:
-                async with session.get(f"{endpoint}/mcp/info", timeout=5) as response:
-                    return response.status == 200
-            except:
-                return False
+        return await self._detect_any(session, endpoint, ("/.well-known/mcp", "/mcp/info"))
     
     async def _detect_a2a(self, session: aiohttp.ClientSession, endpoint: str) -> bool:
         """Detect if endpoint supports A2A"""
-        try:
-            async with session.get(f"{endpoint}/.well-known/agent.json", timeout=5) as response:
-                return response.status == 200
-        except:
-            return False
+        return await self._detect_any(session, endpoint, ("/.well-known/agent.json",))
     
     async def _detect_openapi(self, session: aiohttp.ClientSession, endpoint: str) -> bool:
         """Detect if endpoint supports OpenAPI"""
-        try:
-            async with session.get(f"{endpoint}/openapi.json", timeout=5) as response:
-                return response.status == 200
-        except:
-            try:
-                async with session.get(f"{endpoint}/api/docs", timeout=5) as response:
-                    return response.status == 200
-            except:
-                return False
+        return await self._detect_any(session, endpoint, ("/openapi.json", "/api/docs"))
     
     async def _detect_rest(self, session: aiohttp.ClientSession, endpoint: str) -> bool:
         """Detect if endpoint supports basic REST"""
         try:
             # Simple ping to base endpoint
-            async with session.get(endpoint, timeout=5) as response:
-                return response.status < 500
-        except:
+            return await self._probe(session, endpoint) < 500
+        except (aiohttp.ClientError, asyncio.TimeoutError):
             return False
 
 class HealthMonitor:
     """Health monitoring for registered agents"""
     
+    # Tiered probe intervals (seconds): failing agents are rechecked quickly,
+    # fast and consistently healthy agents are probed rarely
+    failing_interval = 10
+    stable_interval = 600
+    stable_latency_ms = 50.0
+    stable_uptime = 99.0
+    stable_min_checks = 10
+    
     def __init__(self, check_interval: int = 60):
         self.check_interval = check_interval
-        self.health_history = {}
+        self.tick_interval = min(10, check_interval)
+        self.health_history: Dict[str, HealthHistory] = {}  # agent_id -> last 100 results
+        self.next_check_due: Dict[str, float] = {}  # agent_id -> monotonic deadline
+        self.agents: Dict[str, AgentRegistration] = {}
         self.monitoring_active = False
         self.check_task = None
     
@@ -220,27 +345,54 @@ class HealthMonitor:
         while self.monitoring_active:
             try:
                 await self._check_all_agents()
-                await asyncio.sleep(self.check_interval)
+                await asyncio.sleep(self.tick_interval)
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in health monitoring loop: {e}")
+                logger.error("Error in health monitoring loop: %s", e)
                 await asyncio.sleep(10)  # Brief pause before retry
     
+    def effective_interval(self, agent_id: str, registration: AgentRegistration) -> float:
+        """Probe interval for an agent based on its recent health"""
+        if registration.health_status in ("error", "unhealthy"):
+            return self.failing_interval
+        
+        history = self.health_history.get(agent_id)
+        if (history and len(history) >= self.stable_min_checks
+                and history.uptime_percentage > self.stable_uptime
+                and history.average_response_time < self.stable_latency_ms):
+            return self.stable_interval
+        
+        return self.check_interval
+    
     async def _check_all_agents(self):
-        """Check health of all registered agents"""
+        """Check health of registered agents whose probe interval has elapsed"""
         tasks = []
+        now = time.monotonic()
         
         for agent_id, registration in self.agents.items():
             if registration.status == AgentStatus.ACTIVE and registration.health_check_url:
+                if now < self.next_check_due.get(agent_id, 0.0):
+                    continue
                 tasks.append(self._check_agent_health(agent_id, registration))
         
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
     
+    def _record_result(self, agent_id: str, result: HealthCheckResult):
+        """Store a health check result and schedule the agent's next probe"""
+        history = self.health_history.get(agent_id)
+        if history is None:
+            history = self.health_history[agent_id] = HealthHistory(maxlen=100)
+        history.append(result)
+        
+        registration = self.agents.get(agent_id)
+        if registration is not None:
+            self.next_check_due[agent_id] = time.monotonic() + self.effective_interval(agent_id, registration)
+    
     async def _check_agent_health(self, agent_id: str, registration: AgentRegistration) -> HealthCheckResult:
         """Check health of a single agent"""
-        start_time = datetime.now(timezone.utc)
+        start_ns = time.monotonic_ns()
         
         try:
             async with aiohttp.ClientSession() as session:
@@ -250,14 +402,13 @@ class HealthMonitor:
                 check_url = registration.health_check_url or f"{registration.endpoint}/health"
                 
                 async with session.get(check_url, timeout=timeout) as response:
-                    end_time = datetime.now(timezone.utc)
-                    response_time = (end_time - start_time).total_seconds() * 1000
+                    response_time = (time.monotonic_ns() - start_ns) / 1e6
                     
                     result = HealthCheckResult(
                         agent_id=agent_id,
                         status="healthy" if response.status == 200 else "unhealthy",
                         response_time_ms=response_time,
-                        timestamp=end_time.isoformat(),
+                        timestamp=datetime.now(timezone.utc).isoformat(),
                         details={
                             "http_status": response.status,
                             "endpoint": check_url
@@ -270,42 +421,34 @@ class HealthMonitor:
                     else:
                         registration.health_status = "unhealthy"
                     
-                    # Store in history
-                    if agent_id not in self.health_history:
-                        self.health_history[agent_id] = []
-                    
-                    self.health_history[agent_id].append(result)
-                    
-                    # Keep only last 100 results per agent
-                    if len(self.health_history[agent_id]) > 100:
-                        self.health_history[agent_id] = self.health_history[agent_id][-100:]
+                    self._record_result(agent_id, result)
                     
                     return result
                     
         except Exception as e:
-            end_time = datetime.now(timezone.utc)
-            response_time = (end_time - start_time).total_seconds() * 1000
+            response_time = (time.monotonic_ns() - start_ns) / 1e6
             
             result = HealthCheckResult(
                 agent_id=agent_id,
                 status="error",
                 response_time_ms=response_time,
-                timestamp=end_time.isoformat(),
+                timestamp=datetime.now(timezone.utc).isoformat(),
                 error=str(e),
                 details={"error_type": type(e).__name__}
             )
             
             registration.health_status = "error"
             
-            if agent_id not in self.health_history:
-                self.health_history[agent_id] = []
-            
-            self.health_history[agent_id].append(result)
+            self._record_result(agent_id, result)
             
             return result
 
 class MultiLanguageAgentRegistry:
-    """Enhanced registry for multi-language agents"""
+    """Enhanced registry for multi-language agents
+    
+    Storage writes and health checks run as background tasks on the event loop
+    the registry was created on; call aclose() before that loop is closed.
+    """
     
     def __init__(
         self,
@@ -319,15 +462,117 @@ class MultiLanguageAgentRegistry:
         self.capability_index = {}  # capability -> [agent_ids]
         self.protocol_index = {}    # protocol -> [agent_ids]
         self.language_index = {}    # language -> [agent_ids]
+        self._enum_values: Dict[str, Tuple[str, Tuple[str, ...]]] = {}  # agent_id -> (language, protocols)
         
         # Components
         self.protocol_detector = ProtocolDetector()
         self.health_monitor = HealthMonitor(health_check_interval)
         self.require_approval = require_approval
         
+        # Per-agent webhook secrets used as HMAC keys; loaded from agent_webhooks on a miss
+        self._webhook_secrets: Dict[str, bytes] = {}
+        
+        # Strong references to fire-and-forget tasks so they are not collected mid-flight
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+        # Registration writes are queued and flushed in batches by a single writer task;
+        # whatever queues up while one batch is being written forms the next
+        self._write_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.write_batch_size = 64
+        
         # Start health monitoring if enabled
         if enable_health_monitoring:
-            asyncio.create_task(self._start_health_monitoring())
+            self._spawn(self._start_health_monitoring())
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Schedule a background task and keep a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    def _queue_storage_write(self, collection: str, document: Dict[str, Any]) -> asyncio.Future:
+        """Queue a document for the background storage flusher
+        
+        Returns a future resolved once the document's batch has been persisted,
+        or failed with the storage error.
+        """
+        written = asyncio.get_running_loop().create_future()
+        self._ensure_writer().put_nowait((collection, document, written))
+        return written
+    
+    def _ensure_writer(self) -> asyncio.Queue:
+        """Create the write queue and start its flusher on the running loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._write_loop is not loop:
+            # First write, or a new event loop: documents the old loop never
+            # wrote carry over, without their callers' futures
+            old_queue = self._write_queue
+            self._write_loop = loop
+            self._write_queue = asyncio.Queue()
+            self._flush_task = None
+            while old_queue is not None and not old_queue.empty():
+                collection, document, _ = old_queue.get_nowait()
+                self._write_queue.put_nowait((collection, document, None))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._spawn(self._storage_flusher())
+        return self._write_queue
+    
+    async def _storage_flusher(self):
+        """Drain queued writes, coalescing up to write_batch_size documents per flush"""
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.write_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                logger.error("Error persisting %d queued registry writes: %s", len(batch), e)
+                for _, _, written in batch:
+                    if written is not None and not written.done():
+                        written.set_exception(e)
+            else:
+                for _, _, written in batch:
+                    if written is not None and not written.done():
+                        written.set_result(None)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _write_batch(self, batch: List[tuple]):
+        """Persist a batch of (collection, document, future) items"""
+        by_collection: Dict[str, List[Dict[str, Any]]] = {}
+        for collection, document, _ in batch:
+            by_collection.setdefault(collection, []).append(document)
+        
+        write_many = getattr(self.storage, "write_many", None)
+        for collection, documents in by_collection.items():
+            if write_many is not None:
+                await write_many(collection, documents)
+            else:
+                # Backends without bulk support get the documents one at a time
+                for document in documents:
+                    await self.storage.write(collection, document)
+    
+    async def flush_storage(self):
+        """Wait until all queued registry writes have been persisted"""
+        if self._write_queue is not None:
+            await self._ensure_writer().join()
+    
+    async def aclose(self):
+        """Persist queued writes, then stop health monitoring and background tasks"""
+        await self.flush_storage()
+        await self.health_monitor.stop_monitoring()
+        
+        tasks = list(self._background_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._flush_task = None
     
     async def _start_health_monitoring(self):
         """Start health monitoring after a short delay"""
@@ -353,7 +598,8 @@ class MultiLanguageAgentRegistry:
             if auto_detect_protocols and not registration.protocols:
                 detected_protocols = await self.protocol_detector.detect_protocols(registration.endpoint)
                 registration.protocols = detected_protocols
-                logger.info(f"Auto-detected protocols for {registration.agent_id}: {[p.value for p in detected_protocols]}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Auto-detected protocols for %s: %s", registration.agent_id, [p.value for p in detected_protocols])
             
             # Generate authentication token
             registration.auth_token = self._generate_agent_token(registration)
@@ -368,26 +614,27 @@ class MultiLanguageAgentRegistry:
             # Update indexes
             self._update_indexes(registration)
             
-            # Store in persistent storage
-            await self.storage.write("agent_registrations", asdict(registration))
+            # Persist in a batch with concurrent registrations, reporting success only once stored
+            await self._queue_storage_write("agent_registrations", registration.to_dict())
             
             # Log registration
-            logger.info(f"Registered agent: {registration.agent_id} ({registration.language.value})")
+            language_value, protocol_values = self._get_enum_values(registration)
+            logger.info("Registered agent: %s (%s)", registration.agent_id, language_value)
             
             # Start health check for new agent
             if registration.health_check_url:
-                asyncio.create_task(self._immediate_health_check(registration))
+                self._spawn(self._immediate_health_check(registration))
             
             return {
                 "status": "success",
                 "agent_id": registration.agent_id,
                 "auth_token": registration.auth_token,
-                "detected_protocols": [p.value for p in registration.protocols],
+                "detected_protocols": protocol_values,
                 "message": "Agent registered successfully"
             }
             
         except Exception as e:
-            logger.error(f"Error registering agent {registration.agent_id}: {e}")
+            logger.error("Error registering agent %s: %s", registration.agent_id, e)
             return {
                 "status": "error",
                 "message": str(e)
@@ -455,12 +702,13 @@ class MultiLanguageAgentRegistry:
             if language and registration.language != language:
                 continue
             
+            language_value, protocol_values = self._get_enum_values(registration)
             candidates.append({
                 "agent_id": agent_id,
                 "name": registration.name,
                 "description": registration.description,
-                "language": registration.language.value,
-                "protocols": [p.value for p in registration.protocols],
+                "language": language_value,
+                "protocols": protocol_values,
                 "capabilities": registration.capabilities,
                 "status": registration.status.value,
                 "endpoint": registration.endpoint,
@@ -496,7 +744,7 @@ class MultiLanguageAgentRegistry:
             {"status": status.value, "metadata": registration.metadata}
         )
         
-        logger.info(f"Updated agent {agent_id} status: {old_status.value} -> {status.value}")
+        logger.info("Updated agent %s status: %s -> %s", agent_id, old_status.value, status.value)
         
         return {
             "status": "success",
@@ -512,11 +760,11 @@ class MultiLanguageAgentRegistry:
             return None
         
         # Get health history
-        health_history = self.health_monitor.health_history.get(agent_id, [])
+        health_history = self.health_monitor.health_history.get(agent_id)
         
         return {
-            "registration": asdict(registration),
-            "health_history": health_history[-10:],  # Last 10 health checks
+            "registration": registration.to_dict(),
+            "health_history": list(health_history or ())[-10:],  # Last 10 health checks
             "uptime_percentage": self._calculate_uptime(health_history),
             "average_response_time": self._calculate_avg_response_time(health_history)
         }
@@ -539,6 +787,7 @@ class MultiLanguageAgentRegistry:
         
         # Generate webhook secret
         webhook_secret = self._generate_webhook_secret(agent_id)
+        self._webhook_secrets[agent_id] = webhook_secret.encode()
         
         # Store webhook info
         webhook_info = {
@@ -562,8 +811,9 @@ class MultiLanguageAgentRegistry:
         """Handle incoming webhook from an agent"""
         try:
             # Verify webhook signature
+            await self._load_webhook_secret(agent_id)
             if not self._verify_webhook_signature(agent_id, payload, signature):
-                logger.warning(f"Invalid webhook signature for agent {agent_id}")
+                logger.warning("Invalid webhook signature for agent %s", agent_id)
                 return False
             
             # Process webhook based on event type
@@ -579,7 +829,7 @@ class MultiLanguageAgentRegistry:
             return True
             
         except Exception as e:
-            logger.error(f"Error handling webhook for agent {agent_id}: {e}")
+            logger.error("Error handling webhook for agent %s: %s", agent_id, e)
             return False
     
     async def _handle_health_webhook(self, agent_id: str, payload: Dict[str, Any]):
@@ -609,14 +859,14 @@ class MultiLanguageAgentRegistry:
                 status_enum = AgentStatus(new_status)
                 await self.update_agent_status(agent_id, status_enum)
             except ValueError:
-                logger.error(f"Invalid status in webhook: {new_status}")
+                logger.error("Invalid status in webhook: %s", new_status)
     
     def _validate_registration(self, registration: AgentRegistration) -> bool:
         """Validate agent registration data"""
         required_fields = ["agent_id", "name", "description", "language", "endpoint"]
         
-        for field in required_fields:
-            if not getattr(registration, field):
+        for name in required_fields:
+            if not getattr(registration, name):
                 return False
         
         # Basic format validation
@@ -630,9 +880,9 @@ class MultiLanguageAgentRegistry:
         errors = []
         
         required_fields = ["agent_id", "name", "description", "language", "endpoint"]
-        for field in required_fields:
-            if not getattr(registration, field):
-                errors.append(f"Missing required field: {field}")
+        for name in required_fields:
+            if not getattr(registration, name):
+                errors.append(f"Missing required field: {name}")
         
         if registration.endpoint and not registration.endpoint.startswith(("http://", "https://")):
             errors.append("Invalid endpoint URL format")
@@ -642,19 +892,37 @@ class MultiLanguageAgentRegistry:
     def _generate_agent_token(self, registration: AgentRegistration) -> str:
         """Generate authentication token for agent"""
         data = f"{registration.agent_id}:{registration.endpoint}:{datetime.now(timezone.utc).isoformat()}"
-        return hashlib.sha256(data.encode()).hexdigest()
+        return hashlib.blake2b(data.encode(), digest_size=32).hexdigest()
     
     def _generate_webhook_secret(self, agent_id: str) -> str:
         """Generate webhook secret for an agent"""
         return secrets.token_urlsafe(32)
     
+    async def _load_webhook_secret(self, agent_id: str) -> Optional[bytes]:
+        """Webhook secret for an agent, read back from storage after a restart"""
+        secret = self._webhook_secrets.get(agent_id)
+        if secret is None and self.storage is not None:
+            webhooks = await self.storage.query("agent_webhooks", filters={"agent_id": agent_id})
+            if webhooks:
+                # The most recently created webhook holds the current secret
+                latest = max(webhooks, key=lambda webhook: webhook.get("created_at", ""))
+                secret = self._webhook_secrets[agent_id] = latest["secret"].encode()
+        return secret
+    
     def _verify_webhook_signature(self, agent_id: str, payload: Dict[str, Any], signature: str) -> bool:
         """Verify webhook signature"""
-        # In production, use proper HMAC verification
-        # This is a simplified implementation
-        expected_data = json.dumps(payload, sort_keys=True)
-        expected_signature = hashlib.sha256(f"{expected_data}:{agent_id}".encode()).hexdigest()
-        return secrets.compare_digest(signature, expected_signature)
+        # HMAC-SHA256 over the canonical payload, keyed with the agent's webhook secret
+        secret = self._webhook_secrets.get(agent_id)
+        if secret is None:
+            return False
+        
+        try:
+            received = bytes.fromhex(signature)
+        except (TypeError, ValueError):
+            return False
+        
+        expected = hmac.digest(secret, _canonical_json(payload), "sha256")
+        return hmac.compare_digest(expected, received)
     
     def _update_indexes(self, registration: AgentRegistration, old_capabilities: List[str] = None):
         """Update capability, protocol, and language indexes"""
@@ -686,64 +954,71 @@ class MultiLanguageAgentRegistry:
             self.language_index[language] = []
         if agent_id not in self.language_index[language]:
             self.language_index[language].append(agent_id)
+        
+        # Refresh the cached enum value strings for this agent
+        self._enum_values.pop(agent_id, None)
+        self._get_enum_values(registration)
+    
+    def _get_enum_values(self, registration: AgentRegistration) -> Tuple[str, Tuple[str, ...]]:
+        """Language and protocol value strings, cached and shared across responses"""
+        values = self._enum_values.get(registration.agent_id)
+        if values is None:
+            values = self._enum_values[registration.agent_id] = (
+                registration.language.value,
+                tuple(protocol.value for protocol in registration.protocols)
+            )
+        return values
     
     async def _immediate_health_check(self, registration: AgentRegistration):
         """Perform immediate health check on newly registered agent"""
         try:
-            start_time = datetime.now(timezone.utc)
+            start_ns = time.monotonic_ns()
             
             async with aiohttp.ClientSession() as session:
                 check_url = registration.health_check_url or f"{registration.endpoint}/health"
                 timeout = aiohttp.ClientTimeout(total=10)
                 
                 async with session.get(check_url, timeout=timeout) as response:
-                    end_time = datetime.now(timezone.utc)
-                    response_time = (end_time - start_time).total_seconds() * 1000
+                    response_time = (time.monotonic_ns() - start_ns) / 1e6
                     
                     registration.health_status = "healthy" if response.status == 200 else "unhealthy"
-                    registration.last_heartbeat = end_time.isoformat()
+                    registration.last_heartbeat = datetime.now(timezone.utc).isoformat()
                     registration.latency_ms = response_time
                     
         except Exception as e:
             registration.health_status = "error"
             registration.last_heartbeat = datetime.now(timezone.utc).isoformat()
-            logger.error(f"Immediate health check failed for {registration.agent_id}: {e}")
+            logger.error("Immediate health check failed for %s: %s", registration.agent_id, e)
     
-    def _calculate_uptime(self, health_history: List[HealthCheckResult]) -> float:
+    def _calculate_uptime(self, health_history: Optional[HealthHistory]) -> float:
         """Calculate uptime percentage from health history"""
         if not health_history:
             return 0.0
         
-        healthy_checks = sum(1 for check in health_history if check.status == "healthy")
-        total_checks = len(health_history)
-        
-        return (healthy_checks / total_checks) * 100 if total_checks > 0 else 0.0
+        return health_history.uptime_percentage
     
-    def _calculate_avg_response_time(self, health_history: List[HealthCheckResult]) -> float:
+    def _calculate_avg_response_time(self, health_history: Optional[HealthHistory]) -> float:
         """Calculate average response time from health history"""
         if not health_history:
             return 0.0
         
-        response_times = [check.response_time_ms for check in health_history if check.response_time_ms is not None]
-        
-        return sum(response_times) / len(response_times) if response_times else 0.0
+        return health_history.average_response_time
     
     async def get_registry_stats(self) -> Dict[str, Any]:
         """Get registry statistics"""
         total_agents = len(self.agents)
-        active_agents = sum(1 for reg in self.agents.values() if reg.status == AgentStatus.ACTIVE)
+        active_agents = 0
+        language_counts = Counter()
+        protocol_counts = Counter()
         
-        language_stats = {}
-        for language in AgentLanguage:
-            count = sum(1 for reg in self.agents.values() if reg.language == language)
-            if count > 0:
-                language_stats[language.value] = count
+        for reg in self.agents.values():
+            if reg.status == AgentStatus.ACTIVE:
+                active_agents += 1
+            language_counts[reg.language] += 1
+            protocol_counts.update(set(reg.protocols))
         
-        protocol_stats = {}
-        for protocol in AgentProtocol:
-            count = sum(1 for reg in self.agents.values() if protocol in reg.protocols)
-            if count > 0:
-                protocol_stats[protocol.value] = count
+        language_stats = {language.value: count for language, count in language_counts.items()}
+        protocol_stats = {protocol.value: count for protocol, count in protocol_counts.items()}
         
         return {
             "total_agents": total_agents,
@@ -762,6 +1037,7 @@ __all__ = [
     'AgentLanguage',
     'AgentRegistration',
     'HealthCheckResult',
+    'HealthHistory',
     'ProtocolDetector',
     'HealthMonitor',
     'MultiLanguageAgentRegistry'
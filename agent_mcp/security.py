@@ -13,19 +13,53 @@ This module provides enterprise-grade security for AI agents including:
 import json
 import uuid
 import hashlib
+import hmac
 import secrets
+import sys
 import asyncio
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, Callable, Union, Set, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Callable, Union, Set, Tuple, FrozenSet, Iterable
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import jwt
 import bcrypt
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Pre-bound for the audit hot path, saving the attribute lookups per entry
+_UTC = timezone.utc
+_utcnow = datetime.now
+
+# [epoch second, ISO string] of the last coarse timestamp formatted
+_coarse_timestamp = [0, ""]
+
+def _iso_now_coarse() -> str:
+    """Current UTC time as ISO 8601 at one-second resolution, formatted at most once per second"""
+    now = int(time.time())
+    cached = _coarse_timestamp
+    if cached[0] != now:
+        cached[1] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        cached[0] = now
+    return cached[1]
+
+def _canonical_json(data: Any) -> bytes:
+    """Serialize to compact, key-sorted UTF-8 JSON for hashing and signing"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
 class Permission(Enum):
     """Agent permissions for zero-trust authorization"""
     READ_CONTEXT = "context:read"
@@ -39,6 +73,20 @@ class Permission(Enum):
     AGENT_DISCOVERY = "agent:discover"
     SYSTEM_ADMIN = "system:admin"
 
+# Permission -> claim string, so token minting skips the Enum .value descriptor
+_PERMISSION_VALUES = {permission: permission.value for permission in Permission}
+
+# Permissions granted by the initial token issued with a new identity
+_DEFAULT_INITIAL_PERMISSIONS = (
+    Permission.READ_CONTEXT,
+    Permission.WRITE_CONTEXT,
+    Permission.EXECUTE_TASK,
+    Permission.CALL_TOOL
+)
+
+# Tokens longer than this, or without the three JWT segments, are rejected unparsed
+_MAX_TOKEN_LENGTH = 8192
+
 class SecurityLevel(Enum):
     """Security levels for agents"""
     LOW = "low"
@@ -46,7 +94,15 @@ class SecurityLevel(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
-@dataclass
+# Ordering of security levels, from least to most privileged
+_SECURITY_LEVEL_RANK = {
+    SecurityLevel.LOW: 1,
+    SecurityLevel.MEDIUM: 2,
+    SecurityLevel.HIGH: 3,
+    SecurityLevel.CRITICAL: 4
+}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class AgentIdentity:
     """Decentralized identity for an AI agent"""
     agent_id: str
@@ -54,32 +110,55 @@ class AgentIdentity:
     public_key: str
     capabilities: List[str]
     owner: Optional[str]  # Human owner's identity
-    created_at: str
+    created_at: Optional[str] = None  # Defaults to the creation time
     security_level: SecurityLevel = SecurityLevel.MEDIUM
     reputation_score: float = 0.0
     last_active: Optional[str] = None
     metadata: Dict[str, Any] = None
+    # Set form of capabilities for authorization checks, built once at creation
+    capability_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    # Encoded public key, appended to signed data in verify_identity()
+    public_key_bytes: bytes = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
         if self.created_at is None:
             self.created_at = datetime.now(timezone.utc).isoformat()
+        self.capability_set = frozenset(self.capabilities or ())
+        self.public_key_bytes = self.public_key.encode()
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AccessPolicy:
     """Access control policy for zero-trust authorization"""
     name: str
-    required_capabilities: List[str]
+    required_capabilities: Iterable[str]
     required_permissions: List[Permission]
     max_task_value: Optional[float] = None
-    allowed_targets: Optional[List[str]] = None
-    denied_targets: Optional[List[str]] = None
+    allowed_targets: Optional[Iterable[str]] = None
+    denied_targets: Optional[Iterable[str]] = None
     time_restrictions: Optional[Dict[str, Any]] = None
     security_level_required: SecurityLevel = SecurityLevel.MEDIUM
     rate_limits: Optional[Dict[str, Dict[str, int]]] = None
+    
+    def __post_init__(self):
+        # Policies are static once registered, so compile the lookups to frozensets
+        self.required_capabilities = frozenset(self.required_capabilities)
+        if self.allowed_targets is not None:
+            self.allowed_targets = frozenset(self.allowed_targets)
+        if self.denied_targets is not None:
+            self.denied_targets = frozenset(self.denied_targets)
+
+# prev_hash of the first entry in an agent's audit chain
+GENESIS_HASH = "0" * 64
+
+def _audit_hash(prev_hash: str, timestamp: str, agent_id: str, action: str, target: str, result: str) -> str:
+    """SHA-256 over the previous hash and the audit fields, joined by the ASCII unit separator"""
+    return hashlib.sha256(
+        b"\x1f".join(field.encode("utf-8") for field in (prev_hash, timestamp, agent_id, action, target, result))
+    ).hexdigest()
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AuditLogEntry:
     """Immutable audit log entry"""
     timestamp: str
@@ -95,24 +174,17 @@ class AuditLogEntry:
     user_agent: Optional[str] = None
     risk_score: float = 0.0
     metadata: Dict[str, Any] = None
+    prev_hash: str = GENESIS_HASH  # Hash of the agent's previous audit entry
     
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
         if self.timestamp is None:
-            self.timestamp = datetime.now(timezone.utc).isoformat()
+            self.timestamp = _utcnow(_UTC).isoformat()
     
     def compute_hash(self) -> str:
-        """Compute cryptographic hash for integrity"""
-        entry_data = {
-            "timestamp": self.timestamp,
-            "agent_id": self.agent_id,
-            "action": self.action,
-            "target": self.target,
-            "result": self.result
-        }
-        entry_str = json.dumps(entry_data, sort_keys=True)
-        return hashlib.sha256(entry_str.encode()).hexdigest()
+        """Compute cryptographic hash for integrity, chained to the previous entry"""
+        return _audit_hash(self.prev_hash, self.timestamp, self.agent_id, self.action, self.target, self.result)
 
 class DecentralizedIdentityManager:
     """Manager for decentralized agent identities using DIDs"""
@@ -139,8 +211,8 @@ class DecentralizedIdentityManager:
     ) -> AgentIdentity:
         """Create a new agent identity"""
         # Generate key pair
-        private_key = secrets.token_urlsafe(32)
-        public_key = hashlib.sha256(private_key.encode()).hexdigest()
+        private_key = secrets.token_bytes(32)
+        public_key = hashlib.sha256(private_key).hexdigest()
         
         # Create DID
         did = self.create_did(agent_id, public_key)
@@ -161,13 +233,25 @@ class DecentralizedIdentityManager:
         logger.info(f"Created identity for agent {agent_id}: {did}")
         return identity
     
-    def verify_identity(self, identity: AgentIdentity, signature: str, data: str) -> bool:
-        """Verify an agent's identity using cryptographic signature"""
+    def verify_identity(self, identity: AgentIdentity, signature: Union[str, bytes], data: Union[str, bytes]) -> bool:
+        """Verify an agent's identity using cryptographic signature
+        
+        The signature is the SHA-256 digest of data followed by the public key,
+        either as raw bytes or hex-encoded.
+        """
         if identity.agent_id in self.revoked:
             return False
         
-        expected_hash = hashlib.sha256(f"{data}{identity.public_key}".encode()).hexdigest()
-        return secrets.compare_digest(signature, expected_hash)
+        if isinstance(signature, str):
+            try:
+                signature = bytes.fromhex(signature)
+            except ValueError:
+                return False
+        if isinstance(data, str):
+            data = data.encode()
+        
+        expected_digest = hashlib.sha256(data + identity.public_key_bytes).digest()
+        return secrets.compare_digest(signature, expected_digest)
     
     def create_verifiable_credential(
         self,
@@ -199,20 +283,42 @@ class DecentralizedIdentityManager:
     
     def _sign_credential(self, identity: AgentIdentity, capabilities: List[str]) -> str:
         """Sign a credential (simplified implementation)"""
-        data = f"{identity.did}:{json.dumps(capabilities, sort_keys=True)}"
-        return hashlib.sha256(f"{data}{self.secret_key}".encode()).hexdigest()
+        data = identity.did.encode() + b":" + _canonical_json(capabilities)
+        return hashlib.sha256(data + self.secret_key.encode()).hexdigest()
 
 class ZeroTrustAuthorizer:
     """Zero Trust authorization engine with ABAC (Attribute-Based Access Control)"""
     
+    # Action namespace (text before the first ":") -> policy name
+    POLICY_BY_PREFIX = {
+        "tool": "tool_access",
+        "message": "agent_communication",
+        "payment": "payment_management",
+        "system": "system_admin"
+    }
+    DEFAULT_POLICY = "tool_access"
+    
     def __init__(self, secret_key: str):
         self.secret_key = secret_key
         self.policies: Dict[str, AccessPolicy] = {}
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
-        self.decision_cache = {}
+        # Session info by token ID, least recently used first; bounded by max_sessions
+        self.active_sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_sessions = 50000
+        self.sessions_by_agent: Dict[str, Set[str]] = defaultdict(set)  # agent_id -> its session IDs
+        
+        # (did, security level, policy, target) -> (expires_at, denial or None)
+        self.decision_cache: "OrderedDict[Tuple, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self.decision_cache_size = 8192
+        self.decision_cache_ttl = 30.0
+        
+        # LRU of decoded token payloads keyed by a digest of the token (raw tokens are not kept)
+        self.token_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self.token_cache_size = 4096
         
         # Default policies
         self._setup_default_policies()
+        # Immutable snapshot of policy names for status reads; rebuilt when policies change
+        self.policy_names: Tuple[str, ...] = tuple(self.policies)
     
     def _setup_default_policies(self):
         """Setup default zero-trust policies"""
@@ -262,6 +368,12 @@ class ZeroTrustAuthorizer:
             }
         )
     
+    def add_policy(self, policy: AccessPolicy):
+        """Register or replace a policy, invalidating cached decisions"""
+        self.policies[policy.name] = policy
+        self.policy_names = tuple(self.policies)
+        self.decision_cache.clear()
+    
     def check_authorization(
         self,
         identity: AgentIdentity,
@@ -281,6 +393,74 @@ class ZeroTrustAuthorizer:
                 "policy_used": None
             }
         
+        # Identity, capability and target checks only depend on the cache key
+        target = context.get("target")
+        denial = self._check_identity_and_target(identity, policy_name, policy, target)
+        if denial:
+            return dict(denial)
+        
+        # Check task value limits
+        task_value = context.get("value", 0)
+        if policy.max_task_value and task_value > policy.max_task_value:
+            return {
+                "allowed": False,
+                "reason": f"Task value {task_value} exceeds limit {policy.max_task_value}",
+                "policy_used": policy_name
+            }
+        
+        # Check time restrictions
+        if policy.time_restrictions:
+            current_time = datetime.now(timezone.utc)
+            if not self._check_time_restrictions(current_time, policy.time_restrictions):
+                return {
+                    "allowed": False,
+                    "reason": "Access outside allowed time window",
+                    "policy_used": policy_name
+                }
+        
+        # All checks passed
+        return {
+            "allowed": True,
+            "reason": "All authorization checks passed",
+            "policy_used": policy_name
+        }
+    
+    def _check_identity_and_target(
+        self,
+        identity: AgentIdentity,
+        policy_name: str,
+        policy: AccessPolicy,
+        target: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Security level, capability and target checks, cached for decision_cache_ttl seconds"""
+        try:
+            cache_key = (identity.did, identity.security_level, policy_name, target)
+            hash(cache_key)
+        except TypeError:
+            # Unhashable target; evaluate without caching
+            return self._evaluate_identity_and_target(identity, policy_name, policy, target)
+        
+        now = time.monotonic()
+        cached = self.decision_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            self.decision_cache.move_to_end(cache_key)
+            return cached[1]
+        
+        denial = self._evaluate_identity_and_target(identity, policy_name, policy, target)
+        self.decision_cache[cache_key] = (now + self.decision_cache_ttl, denial)
+        self.decision_cache.move_to_end(cache_key)
+        if len(self.decision_cache) > self.decision_cache_size:
+            self.decision_cache.popitem(last=False)
+        return denial
+    
+    def _evaluate_identity_and_target(
+        self,
+        identity: AgentIdentity,
+        policy_name: str,
+        policy: AccessPolicy,
+        target: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Return a denial result, or None if the identity and target satisfy the policy"""
         # Check security level requirement
         if self._compare_security_levels(identity.security_level, policy.security_level_required) < 0:
             return {
@@ -290,8 +470,8 @@ class ZeroTrustAuthorizer:
             }
         
         # Check required capabilities
-        missing_caps = set(policy.required_capabilities) - set(identity.capabilities)
-        if missing_caps:
+        if not policy.required_capabilities.issubset(identity.capability_set):
+            missing_caps = policy.required_capabilities - identity.capability_set
             return {
                 "allowed": False,
                 "reason": f"Missing capabilities: {list(missing_caps)}",
@@ -299,7 +479,6 @@ class ZeroTrustAuthorizer:
             }
         
         # Check target restrictions
-        target = context.get("target")
         if policy.denied_targets and target in policy.denied_targets:
             return {
                 "allowed": False,
@@ -314,54 +493,18 @@ class ZeroTrustAuthorizer:
                 "policy_used": policy_name
             }
         
-        # Check task value limits
-        task_value = context.get("value", 0)
-        if policy.max_task_value and task_value > policy.max_task_value:
-            return {
-                "allowed": False,
-                "reason": f"Task value {task_value} exceeds limit {policy.max_task_value}",
-                "policy_used": policy_name
-            }
-        
-        # Check time restrictions
-        if policy.time_restrictions:
-            current_time = datetime.now(timezone.utc)
-            if not self._check_time_restrictions(current_time, policy.time_restrictions):
-                return {
-                    "allowed": False,
-                    "reason": "Access outside allowed time window",
-                    "policy_used": policy_name
-                }
-        
-        # All checks passed
-        return {
-            "allowed": True,
-            "reason": "All authorization checks passed",
-            "policy_used": policy_name
-        }
+        return None
     
     def _determine_policy(self, action: str, resource: str) -> str:
         """Determine which policy applies to an action"""
-        if action.startswith("tool:"):
-            return "tool_access"
-        elif action.startswith("message:"):
-            return "agent_communication"
-        elif action.startswith("payment:"):
-            return "payment_management"
-        elif action.startswith("system:"):
-            return "system_admin"
-        else:
-            return "tool_access"  # Default
+        prefix, separator, _ = action.partition(":")
+        if not separator:
+            return self.DEFAULT_POLICY
+        return self.POLICY_BY_PREFIX.get(prefix, self.DEFAULT_POLICY)
     
     def _compare_security_levels(self, current: SecurityLevel, required: SecurityLevel) -> int:
-        """Compare security levels (-1: insufficient, 0: equal, 1: sufficient)"""
-        levels = {
-            SecurityLevel.LOW: 1,
-            SecurityLevel.MEDIUM: 2,
-            SecurityLevel.HIGH: 3,
-            SecurityLevel.CRITICAL: 4
-        }
-        return levels[current] - levels[required]
+        """Rank difference between two security levels (negative: insufficient, 0: equal, positive: exceeds)"""
+        return _SECURITY_LEVEL_RANK[current] - _SECURITY_LEVEL_RANK[required]
     
     def _check_time_restrictions(self, current_time: datetime, restrictions: Dict[str, Any]) -> bool:
         """Check if current time is within allowed restrictions"""
@@ -390,14 +533,16 @@ class ZeroTrustAuthorizer:
     ) -> str:
         """Create a short-lived scoped JWT token"""
         now = datetime.utcnow()
+        issued_at = int(time.time())
+        expires_at = issued_at + ttl_minutes * 60
         
         payload = {
             "sub": identity.did,
             "agent_id": identity.agent_id,
-            "permissions": [p.value for p in permissions],
+            "permissions": [_PERMISSION_VALUES[p] for p in permissions],
             "security_level": identity.security_level.value,
-            "iat": int(now.timestamp()),
-            "exp": int((now + timedelta(minutes=ttl_minutes)).timestamp()),
+            "iat": issued_at,
+            "exp": expires_at,
             "jti": str(uuid.uuid4()),  # Unique token ID
             "context": context or {}
         }
@@ -414,27 +559,109 @@ class ZeroTrustAuthorizer:
             "agent_id": identity.agent_id,
             "permissions": permissions,
             "created_at": now.isoformat(),
-            "last_used": now.isoformat(),
+            "last_used": time.time(),  # epoch seconds; see describe_session()
+            "expires_at": expires_at,
             "usage_count": 0
         }
+        self.sessions_by_agent[identity.agent_id].add(session_id)
+        self._evict_sessions()
         
         return token
     
+    def _evict_sessions(self):
+        """Drop expired sessions from the LRU end, then enforce max_sessions"""
+        now = time.time()
+        while self.active_sessions:
+            oldest_id = next(iter(self.active_sessions))
+            if self.active_sessions[oldest_id].get("expires_at", now) >= now:
+                break
+            self._drop_session(oldest_id)
+        
+        while len(self.active_sessions) > self.max_sessions:
+            self._drop_session(next(iter(self.active_sessions)))
+    
+    def _drop_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a session and its reverse-index entry"""
+        session = self.active_sessions.pop(session_id, None)
+        if session is not None:
+            agent_sessions = self.sessions_by_agent.get(session["agent_id"])
+            if agent_sessions is not None:
+                agent_sessions.discard(session_id)
+                if not agent_sessions:
+                    del self.sessions_by_agent[session["agent_id"]]
+        return session
+    
+    def revoke_agent_sessions(self, agent_id: str) -> int:
+        """Remove every active session of an agent, returning how many were removed
+        
+        The agent's bucket is detached with a single pop, and each session is
+        tombstoned before removal so a caller still holding its dict sees it revoked.
+        """
+        session_ids = self.sessions_by_agent.pop(agent_id, frozenset())
+        for session_id in session_ids:
+            session = self.active_sessions.pop(session_id, None)
+            if session is not None:
+                session["revoked"] = True
+        return len(session_ids)
+    
+    def describe_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session info with timestamps formatted for display"""
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            return None
+        
+        info = dict(session)
+        info["last_used"] = datetime.fromtimestamp(session["last_used"], timezone.utc).isoformat()
+        return info
+    
+    @staticmethod
+    def _token_cache_key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    @staticmethod
+    def _copy_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a cached payload and of its top-level claim lists and context dict
+        
+        Values nested inside the context are still shared; copy.deepcopy would
+        cost about as much as the jwt.decode the cache saves.
+        """
+        return {
+            key: value.copy() if isinstance(value, (list, dict)) else value
+            for key, value in payload.items()
+        }
+    
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify and decode a JWT token"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
+            cache_key = self._token_cache_key(token)
+            payload = self.token_cache.get(cache_key)
+            
+            if payload is None:
+                payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
+                self.token_cache[cache_key] = payload
+                if len(self.token_cache) > self.token_cache_size:
+                    self.token_cache.popitem(last=False)
+            else:
+                self.token_cache.move_to_end(cache_key)
             
             # Check if token is expired
-            if datetime.utcnow() > datetime.fromtimestamp(payload["exp"]):
+            if time.time() > payload["exp"]:
+                self.token_cache.pop(cache_key, None)
                 return None
             
             # Check if session is still active
             session_id = payload.get("jti")
-            if session_id and session_id not in self.active_sessions:
-                return None
+            if session_id:
+                session = self.active_sessions.get(session_id)
+                if session is None or session.get("revoked"):
+                    return None
+                if session.get("expires_at", payload["exp"]) < time.time():
+                    self._drop_session(session_id)
+                    return None
+                self.active_sessions.move_to_end(session_id)
             
-            return payload
+            # Copy so callers cannot alter the cached payload
+            return self._copy_payload(payload)
             
         except jwt.InvalidTokenError:
             return None
@@ -444,12 +671,14 @@ class ZeroTrustAuthorizer:
     
     def revoke_token(self, token: str) -> bool:
         """Revoke a JWT token"""
+        self.token_cache.pop(self._token_cache_key(token), None)
+        self.decision_cache.clear()
+        
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
             session_id = payload.get("jti")
             
-            if session_id and session_id in self.active_sessions:
-                del self.active_sessions[session_id]
+            if session_id and self._drop_session(session_id) is not None:
                 logger.info(f"Revoked token session: {session_id}")
                 return True
         except Exception as e:
@@ -461,77 +690,164 @@ class RateLimiter:
     """Advanced rate limiting for agent operations"""
     
     def __init__(self):
-        self.requests = defaultdict(lambda: defaultdict(deque))
+        self.requests: Dict[Tuple[str, str], deque] = {}  # (agent_id, action) -> monotonic timestamps
         self.limits = {}
         self.cleanup_interval = 300  # 5 minutes
-        self.last_cleanup = datetime.now(timezone.utc)
+        self.last_cleanup = time.monotonic()
     
     def set_rate_limit(self, key: str, limit: int, window: int):
         """Set rate limit for a specific key"""
         self.limits[key] = {"limit": limit, "window": window}
     
+    @staticmethod
+    def _wall_clock_iso(monotonic_time: float) -> str:
+        """Convert a monotonic timestamp to an ISO wall-clock time"""
+        wall_time = time.time() + (monotonic_time - time.monotonic())
+        return datetime.fromtimestamp(wall_time, timezone.utc).isoformat()
+    
     def check_rate_limit(self, agent_id: str, action: str) -> Dict[str, Any]:
         """Check if agent is within rate limits"""
         # Cleanup old entries
         self._cleanup_old_entries()
         
-        key = f"{agent_id}:{action}"
         limit_info = self.limits.get(action, {"limit": 100, "window": 60})
+        window = limit_info["window"]
+        key = (agent_id, action)
+        requests = self.requests.get(key)
         
         # Get current requests in window
-        now = datetime.now(timezone.utc)
-        cutoff_time = now - timedelta(seconds=limit_info["window"])
+        now = time.monotonic()
+        cutoff_time = now - window
         
         # Remove old requests
-        while (self.requests[agent_id][action] and 
-               self.requests[agent_id][action][0] < cutoff_time):
-            self.requests[agent_id][action].popleft()
+        while requests and requests[0] < cutoff_time:
+            requests.popleft()
         
         # Check limit
-        request_count = len(self.requests[agent_id][action])
+        request_count = len(requests) if requests else 0
         
         if request_count >= limit_info["limit"]:
             return {
                 "allowed": False,
                 "remaining": 0,
-                "reset_time": (self.requests[agent_id][action][0] + timedelta(seconds=limit_info["window"])).isoformat() if self.requests[agent_id][action] else (now + timedelta(seconds=limit_info["window"])).isoformat(),
+                "reset_time": self._wall_clock_iso((requests[0] if requests else now) + window),
                 "limit": limit_info["limit"],
-                "window": limit_info["window"]
+                "window": window
             }
         
         # Add current request
-        self.requests[agent_id][action].append(now)
+        if requests is None:
+            requests = self.requests[key] = deque()
+        requests.append(now)
         
         return {
             "allowed": True,
             "remaining": limit_info["limit"] - (request_count + 1),
-            "reset_time": (now + timedelta(seconds=limit_info["window"])).isoformat(),
+            "reset_time": self._wall_clock_iso(now + window),
             "limit": limit_info["limit"],
-            "window": limit_info["window"]
+            "window": window
         }
     
     def _cleanup_old_entries(self):
         """Cleanup old rate limit entries"""
-        now = datetime.now(timezone.utc)
+        now = time.monotonic()
         
-        if (now - self.last_cleanup).seconds < self.cleanup_interval:
+        if now - self.last_cleanup < self.cleanup_interval:
             return
         
-        for agent_id in self.requests:
-            for action in self.requests[agent_id]:
-                cutoff_time = now - timedelta(seconds=300)  # 5 minutes
-                while (self.requests[agent_id][action] and 
-                       self.requests[agent_id][action][0] < cutoff_time):
-                    self.requests[agent_id][action].popleft()
+        cutoff_time = now - 300  # 5 minutes
+        for key, requests in list(self.requests.items()):
+            while requests and requests[0] < cutoff_time:
+                requests.popleft()
+            
+            # Drop idle keys so sparse agents do not hold memory
+            if not requests:
+                del self.requests[key]
         
         self.last_cleanup = now
 
+class PasswordVerifier:
+    """bcrypt credential verification with a short-lived LRU of recent results"""
+    
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._cache: "OrderedDict[bytes, Tuple[float, bool]]" = OrderedDict()
+        # Cache keys are keyed digests, so cached entries cannot be used to test guesses offline
+        self._cache_key = secrets.token_bytes(32)
+    
+    def verify(self, password: Union[str, bytes], hashed: Union[str, bytes]) -> bool:
+        """Check a password against a bcrypt hash, reusing recent results"""
+        if isinstance(password, str):
+            password = password.encode("utf-8")
+        if isinstance(hashed, str):
+            hashed = hashed.encode("utf-8")
+        
+        key = hashlib.blake2b(
+            len(password).to_bytes(4, "big") + password + hashed,
+            key=self._cache_key,
+            digest_size=32
+        ).digest()
+        now = time.monotonic()
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                self._cache.move_to_end(key)
+                return cached[1]
+            del self._cache[key]
+        
+        try:
+            result = bcrypt.checkpw(password, hashed)
+        except ValueError:
+            result = False  # Malformed hash
+        
+        # Evict least recently used entries one at a time rather than dropping the whole cache
+        self._cache[key] = (now + self.ttl_seconds, result)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        
+        return result
+    
+    def invalidate(self):
+        """Forget all cached results, e.g. after a credential change"""
+        self._cache.clear()
+
 class AuditLogger:
-    """Immutable audit logging for compliance"""
+    """Immutable audit logging for compliance
+    
+    Entries are written by a background task on the running event loop; call
+    aclose() before that loop exits so nothing buffered is left unwritten.
+    """
     
-    def __init__(self, storage_backend):
+    def __init__(self, storage_backend, secret_key: str = None):
         self.storage = storage_backend  # Could be Firestore, PostgreSQL, etc.
         self.logger = logging.getLogger("audit")
+        self.chain_heads: Dict[str, str] = {}  # agent_id -> hash of its latest audit entry
+        self.chain_lengths: Dict[str, int] = {}  # agent_id -> number of entries in its chain
+        
+        # Every checkpoint_interval entries a signed checkpoint of the chain head is
+        # written to "audit_checkpoints", so a range can be verified from its anchors
+        self.checkpoint_interval = 1000
+        # The checkpoint key is derived from secret_key rather than reusing it, so the
+        # key that signs JWTs never signs audit checkpoints directly
+        self._checkpoint_key = (
+            hmac.digest(secret_key.encode(), b"audit-checkpoint", "sha256") if secret_key else None
+        )
+        
+        # Entries are buffered and written in FIFO batches by a background task;
+        # whatever queues up while one batch is being written forms the next
+        self.max_pending = 10000
+        self.batch_size = 256
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._room: Optional[asyncio.Event] = None  # set whenever the writer frees space
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Aggregated counts for sampled actions, keyed by (agent_id, action, reason)
+        self.sample_window = 1.0  # seconds before a sampled aggregate is written
+        self._samples: Dict[Tuple[str, str, Any], Dict[str, Any]] = {}
+        self._sample_tasks: Set[asyncio.Task] = set()
     
     async def log_action(
         self,
@@ -547,42 +863,296 @@ class AuditLogger:
     ) -> bool:
         """Log an agent action for audit trail"""
         try:
-            # Calculate risk score
-            risk_score = self._calculate_risk_score(action, result, context)
-            
-            entry = AuditLogEntry(
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                agent_id=agent_id,
-                action=action,
-                target=target or "unknown",
-                resource=resource or "unknown",
-                result=result,
-                permission_used=permission_used,
-                task_id=task_id,
-                payment_id=payment_id,
-                risk_score=risk_score,
-                ip_address=context.get("ip_address") if context else None,
-                user_agent=context.get("user_agent") if context else None,
-                metadata=context or {}
+            entry = self._build_entry(
+                agent_id, action, target, resource, result,
+                permission_used, task_id, payment_id, context
             )
+            await self._load_chain_head(agent_id)
             
-            # Store with integrity hash
-            entry_hash = entry.compute_hash()
-            entry_data = asdict(entry)
-            entry_data["hash"] = entry_hash
-            
-            # Store in backend
-            await self.storage.write("audit_logs", entry_data)
+            queue = self._ensure_flusher()
+            await self._wait_for_room(queue)
+            written = self._enqueue(queue, entry)
             
             # Also log to standard logger
             self.logger.info(f"Audit: {agent_id} performed {action} on {target} - {result}")
             
-            return True
+            # Resolved by the background writer once the entry's batch is stored
+            return await written
             
         except Exception as e:
             self.logger.error(f"Failed to log audit entry: {e}")
             return False
     
+    async def log_batch(self, actions: List[Dict[str, Any]]) -> int:
+        """Log several actions at once; each dict holds log_action() keyword arguments
+        
+        Entries are chained and enqueued back to back so the background writer
+        stores them in as few batches as possible. Returns the number stored.
+        """
+        queue = self._ensure_flusher()
+        pending = []
+        for action in actions:
+            try:
+                entry = self._build_entry(**action)
+                await self._load_chain_head(entry.agent_id)
+                await self._wait_for_room(queue)
+                pending.append(self._enqueue(queue, entry))
+            except Exception as e:
+                self.logger.error(f"Failed to log audit entry: {e}")
+        
+        logged = sum(await asyncio.gather(*pending))
+        self.logger.info(f"Audit: logged batch of {logged} actions")
+        return logged
+    
+    def _build_entry(
+        self,
+        agent_id: str,
+        action: str,
+        target: str = None,
+        resource: str = None,
+        result: str = "success",
+        permission_used: str = None,
+        task_id: str = None,
+        payment_id: str = None,
+        context: Dict[str, Any] = None
+    ) -> AuditLogEntry:
+        """Create an unchained audit entry for an action"""
+        return AuditLogEntry(
+            timestamp=_utcnow(_UTC).isoformat(),
+            agent_id=agent_id,
+            action=action,
+            target=target or "unknown",
+            resource=resource or "unknown",
+            result=result,
+            permission_used=permission_used,
+            task_id=task_id,
+            payment_id=payment_id,
+            risk_score=self._calculate_risk_score(action, result, context),
+            ip_address=context.get("ip_address") if context else None,
+            user_agent=context.get("user_agent") if context else None,
+            metadata=context or {}
+        )
+    
+    async def _load_chain_head(self, agent_id: str):
+        """Resume an agent's chain from its stored entries the first time it is logged"""
+        if agent_id in self.chain_heads:
+            return
+        
+        head, length = GENESIS_HASH, 0
+        logs = await self.storage.query("audit_logs", filters={"agent_id": agent_id}) or ()
+        for position, log in enumerate(logs, 1):
+            # Entries written before seq was stored fall back to their position
+            seq = log.get("seq", position)
+            if seq > length and "hash" in log:
+                head, length = log["hash"], seq
+        
+        # Another call may have loaded and extended the chain while this one queried
+        if agent_id not in self.chain_heads:
+            self.chain_heads[agent_id] = head
+            self.chain_lengths[agent_id] = length
+    
+    async def _wait_for_room(self, queue: asyncio.Queue):
+        """Apply backpressure before chaining so a full buffer never reorders entries"""
+        # Keep a spare slot for the checkpoint row an entry may add
+        while queue.maxsize - queue.qsize() < 2:
+            self._room.clear()
+            await self._room.wait()
+    
+    def _enqueue(self, queue: asyncio.Queue, entry: AuditLogEntry) -> asyncio.Future:
+        """Chain an entry to the agent's previous one and hand it to the background writer
+        
+        Returns a future resolved with whether the entry was stored.
+        """
+        # Nothing is awaited between reading the chain head and enqueueing,
+        # so appends cannot interleave
+        agent_id = entry.agent_id
+        entry.prev_hash = self.chain_heads.get(agent_id, GENESIS_HASH)
+        entry_hash = entry.compute_hash()
+        seq = self.chain_lengths.get(agent_id, 0) + 1
+        self.chain_heads[agent_id] = entry_hash
+        self.chain_lengths[agent_id] = seq
+        
+        # Store with integrity hash and 1-based position in the agent's chain
+        entry_data = asdict(entry)
+        entry_data["hash"] = entry_hash
+        entry_data["seq"] = seq
+        
+        written = self._loop.create_future()
+        queue.put_nowait(("audit_logs", entry_data, written))
+        if self._checkpoint_key and seq % self.checkpoint_interval == 0:
+            queue.put_nowait(("audit_checkpoints", {
+                "agent_id": agent_id,
+                "checkpoint_at": seq,
+                "hash": entry_hash,
+                "signature": self._sign_checkpoint(agent_id, seq, entry_hash)
+            }, None))
+        return written
+    
+    async def log_action_sampled(
+        self,
+        agent_id: str,
+        action: str,
+        result: str = "error",
+        sample_rate: float = 0.01,
+        context: Dict[str, Any] = None,
+        **kwargs
+    ) -> bool:
+        """Log a high-volume action, aggregating repeats of the same agent/action/reason
+        
+        The first occurrence in each window is logged in full. Repeats are counted
+        and written as a single entry with a "count" field once 1/sample_rate of
+        them accumulate or sample_window seconds pass.
+        """
+        context = context or {}
+        key = (agent_id, action, context.get("reason"))
+        loop = asyncio.get_running_loop()
+        sample = self._samples.get(key)
+        if sample is not None and (sample["loop"] is not loop or loop.time() >= sample["deadline"]):
+            # The window's timer cannot fire any more (e.g. its loop was closed),
+            # so write what it counted and start a new window
+            del self._samples[key]
+            await self._write_sample(key, sample)
+            sample = self._samples.get(key)
+        
+        if sample is None:
+            sample = self._samples[key] = {
+                "count": 0, "result": result, "context": context, "kwargs": kwargs,
+                "loop": loop, "deadline": loop.time() + self.sample_window
+            }
+            loop.call_later(self.sample_window, self._close_sample_window, key, sample)
+            return await self.log_action(agent_id, action, result=result, context=context, **kwargs)
+        
+        sample["count"] += 1
+        sample["context"] = context
+        if sample["count"] >= max(1, round(1 / sample_rate)):
+            return await self._write_sample(key, sample)
+        return True
+    
+    async def _write_sample(self, key: Tuple[str, str, Any], sample: Dict[str, Any]) -> bool:
+        """Write the repeats counted for a sampled action as one entry"""
+        count = sample["count"]
+        if not count:
+            return True
+        sample["count"] = 0
+        agent_id, action, _ = key
+        return await self.log_action(
+            agent_id,
+            action,
+            result=sample["result"],
+            context={**sample["context"], "count": count},
+            **sample["kwargs"]
+        )
+    
+    def _close_sample_window(self, key: Tuple[str, str, Any], sample: Dict[str, Any]):
+        """End a sampling window, writing any repeats it still holds"""
+        if self._samples.get(key) is not sample:
+            return  # Already replaced by a newer window
+        del self._samples[key]
+        if sample["count"]:
+            task = asyncio.ensure_future(self._write_sample(key, sample))
+            self._sample_tasks.add(task)
+            task.add_done_callback(self._sample_tasks.discard)
+    
+    def _ensure_flusher(self) -> asyncio.Queue:
+        """Create the write buffer and start its flush task on the running loop if needed
+        
+        When the logger is used from a new event loop (e.g. a later asyncio.run()),
+        the buffer is rebuilt there and entries the old loop never wrote carry over.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            old_queue = self._queue
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._room = asyncio.Event()
+            self._flush_task = None
+            # Callers waiting on the old loop are gone, so only the rows move
+            while old_queue is not None and not old_queue.empty():
+                collection, data, _ = old_queue.get_nowait()
+                self._queue.put_nowait((collection, data, None))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_loop())
+        return self._queue
+    
+    async def _flush_loop(self):
+        """Write buffered entries to storage in FIFO batches"""
+        queue, room = self._queue, self._room
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            room.set()
+            
+            stored = False
+            try:
+                await self._write_batch(batch)
+                stored = True
+            except Exception as e:
+                self.logger.error(f"Failed to write {len(batch)} audit entries: {e}")
+            finally:
+                for _, _, written in batch:
+                    if written is not None and not written.done():
+                        written.set_result(stored)
+                    queue.task_done()
+    
+    async def _write_batch(self, batch: List[Tuple[str, Dict[str, Any], Optional[asyncio.Future]]]):
+        """Write a batch of (collection, row, future) items in order"""
+        write_many = getattr(self.storage, "write_many", None)
+        if write_many is None:
+            for collection, data, _ in batch:
+                await self.storage.write(collection, data)
+            return
+        
+        # Keep FIFO order while grouping consecutive rows per collection
+        start = 0
+        for i in range(1, len(batch) + 1):
+            if i == len(batch) or batch[i][0] != batch[start][0]:
+                await write_many(batch[start][0], [item[1] for item in batch[start:i]])
+                start = i
+    
+    async def flush(self):
+        """Wait until all buffered audit entries have been written"""
+        for key, sample in list(self._samples.items()):
+            await self._write_sample(key, sample)
+        if self._sample_tasks:
+            await asyncio.gather(*self._sample_tasks, return_exceptions=True)
+        if self._queue is not None:
+            await self._ensure_flusher().join()
+    
+    async def aclose(self):
+        """Write all buffered entries and stop the background writer
+        
+        Call this before the event loop the logger runs on is closed.
+        """
+        await self.flush()
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    def _sign_checkpoint(self, agent_id: str, seq: int, entry_hash: str) -> str:
+        """HMAC-SHA256 over a checkpoint's agent, position and chain hash"""
+        message = f"{agent_id}:{seq}:{entry_hash}".encode()
+        return hmac.digest(self._checkpoint_key, message, "sha256").hex()
+    
+    async def _load_checkpoints(self, agent_id: str, verification_errors: List[str]) -> Dict[int, str]:
+        """Load an agent's checkpoints, keeping only those with a valid signature"""
+        checkpoints = {}
+        if not self._checkpoint_key:
+            return checkpoints
+        
+        for checkpoint in await self.storage.query("audit_checkpoints", filters={"agent_id": agent_id}) or ():
+            seq = checkpoint.get("checkpoint_at")
+            expected = self._sign_checkpoint(agent_id, seq, checkpoint.get("hash", ""))
+            if hmac.compare_digest(expected, checkpoint.get("signature", "")):
+                checkpoints[seq] = checkpoint["hash"]
+            else:
+                verification_errors.append(f"Invalid checkpoint signature at seq {seq}")
+        return checkpoints
+    
     def _calculate_risk_score(self, action: str, result: str, context: Dict[str, Any]) -> float:
         """Calculate risk score for the action"""
         base_score = 0.0
@@ -608,42 +1178,89 @@ class AuditLogger:
         
         return min(base_score, 1.0)
     
-    async def verify_audit_chain(self, agent_id: str, start_time: str = None, end_time: str = None) -> Dict[str, Any]:
-        """Verify integrity of audit log chain"""
+    async def verify_audit_chain(
+        self,
+        agent_id: str,
+        start_time: str = None,
+        end_time: str = None,
+        start_seq: int = None,
+        end_seq: int = None
+    ) -> Dict[str, Any]:
+        """Verify integrity of audit log chain
+        
+        With start_seq/end_seq only the entries between the bracketing signed
+        checkpoints are hashed, anchored on the checkpoint before them.
+        """
         try:
+            # Make sure buffered entries are visible to the query
+            await self.flush()
+            
+            verification_errors = []
+            checkpoints = await self._load_checkpoints(agent_id, verification_errors)
+            
+            previous_hash = None
+            first_seq = last_seq = None
+            if start_seq is not None or end_seq is not None:
+                # Widen the range out to the nearest checkpoints on either side
+                filters = {"agent_id": agent_id}
+                if start_seq is not None:
+                    anchor = max((seq for seq in checkpoints if seq < start_seq), default=None)
+                    if anchor is not None:
+                        previous_hash = checkpoints[anchor]
+                        first_seq = anchor + 1
+                if end_seq is not None:
+                    last_seq = min((seq for seq in checkpoints if seq >= end_seq), default=end_seq)
+            else:
+                filters = {"agent_id": agent_id, "timestamp_gte": start_time, "timestamp_lte": end_time}
+            
             # Get audit logs for the agent
-            logs = await self.storage.query(
-                "audit_logs", 
-                filters={"agent_id": agent_id, "timestamp_gte": start_time, "timestamp_lte": end_time}
-            )
+            logs = await self.storage.query("audit_logs", filters=filters) or []
+            if all("seq" in log for log in logs):
+                logs = sorted(logs, key=lambda log: log["seq"])
+            
+            # Storage backends only filter by equality and timestamp, so narrow
+            # to the seq range here
+            if first_seq is not None or last_seq is not None:
+                logs = [
+                    log for log in logs
+                    if (first_seq is None or log.get("seq", 0) >= first_seq)
+                    and (last_seq is None or log.get("seq", 0) <= last_seq)
+                ]
             
             if not logs:
                 return {"verified": False, "reason": "No audit logs found"}
             
-            # Verify hash chain
-            verification_errors = []
-            for i, log in enumerate(logs[1:], 1):
+            # Verify hash chain in a single pass: each entry must hash correctly,
+            # link to the entry before it and match any checkpoint taken at it
+            for i, log in enumerate(logs):
                 if "hash" not in log:
                     verification_errors.append(f"Missing hash for log at index {i}")
+                    previous_hash = None
                     continue
                 
-                # Recalculate hash of previous log
-                prev_log = logs[i-1]
-                prev_data = {
-                    "timestamp": prev_log["timestamp"],
-                    "agent_id": prev_log["agent_id"],
-                    "action": prev_log["action"],
-                    "target": prev_log["target"],
-                    "result": prev_log["result"]
-                }
-                expected_hash = hashlib.sha256(json.dumps(prev_data, sort_keys=True).encode()).hexdigest()
+                prev_hash = log.get("prev_hash", GENESIS_HASH)
+                expected_hash = _audit_hash(
+                    prev_hash,
+                    log["timestamp"],
+                    log["agent_id"],
+                    log["action"],
+                    log["target"],
+                    log["result"]
+                )
                 
                 if log["hash"] != expected_hash:
                     verification_errors.append(f"Hash mismatch at index {i}")
+                elif previous_hash is not None and prev_hash != previous_hash:
+                    verification_errors.append(f"Broken chain link at index {i}")
+                elif log.get("seq") in checkpoints and checkpoints[log["seq"]] != log["hash"]:
+                    verification_errors.append(f"Checkpoint mismatch at index {i}")
+                
+                previous_hash = log["hash"]
             
             return {
                 "verified": len(verification_errors) == 0,
                 "total_logs": len(logs),
+                "checkpoints": len(checkpoints),
                 "verification_errors": verification_errors
             }
             
@@ -666,11 +1283,15 @@ class ZeroTrustSecurityLayer:
         self.identity_manager = DecentralizedIdentityManager(did_registry_url, self.secret_key)
         self.authorizer = ZeroTrustAuthorizer(self.secret_key)
         self.rate_limiter = RateLimiter()
-        self.audit_logger = AuditLogger(storage_backend)
+        self.audit_logger = AuditLogger(storage_backend, self.secret_key)
         
         # Setup rate limits
         self._setup_rate_limits()
     
+    async def aclose(self):
+        """Flush the audit log and stop its background writer"""
+        await self.audit_logger.aclose()
+    
     def _setup_rate_limits(self):
         """Setup default rate limits"""
         self.rate_limiter.set_rate_limit("tool:call", 200, 60)  # 200 tool calls per minute
@@ -697,12 +1318,7 @@ class ZeroTrustSecurityLayer:
         # Create initial token
         token = self.authorizer.create_scoped_token(
             identity=identity,
-            permissions=[
-                Permission.READ_CONTEXT,
-                Permission.WRITE_CONTEXT,
-                Permission.EXECUTE_TASK,
-                Permission.CALL_TOOL
-            ],
+            permissions=list(_DEFAULT_INITIAL_PERMISSIONS),
             ttl_minutes=60  # Longer initial token
         )
         
@@ -716,14 +1332,26 @@ class ZeroTrustSecurityLayer:
         return identity, token
     
     async def authenticate_agent(self, token: str, action: str, context: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
-        """Authenticate an agent token for a specific action"""
+        """Authenticate an agent token for a specific action
+        
+        Failures are audited through log_action_sampled so a burst of bad
+        requests cannot turn into one audit write each; successes are always logged.
+        """
+        # Reject tokens that cannot be a JWT without decoding them
+        if not isinstance(token, str) or len(token) > _MAX_TOKEN_LENGTH or token.count(".") != 2:
+            await self.audit_logger.log_action_sampled(
+                agent_id="unknown",
+                action="auth:failed",
+                context={"reason": "malformed_token"}
+            )
+            return None
+        
         # Verify token
         token_data = self.authorizer.verify_token(token)
         if not token_data:
-            await self.audit_logger.log_action(
+            await self.audit_logger.log_action_sampled(
                 agent_id="unknown",
                 action="auth:failed",
-                result="error",
                 context={"reason": "invalid_token"}
             )
             return None
@@ -732,10 +1360,9 @@ class ZeroTrustSecurityLayer:
         agent_id = token_data["agent_id"]
         identity = self.identity_manager.identities.get(agent_id)
         if not identity:
-            await self.audit_logger.log_action(
+            await self.audit_logger.log_action_sampled(
                 agent_id=agent_id,
                 action="auth:failed",
-                result="error",
                 context={"reason": "identity_not_found"}
             )
             return None
@@ -743,10 +1370,9 @@ class ZeroTrustSecurityLayer:
         # Check rate limits
         rate_check = self.rate_limiter.check_rate_limit(agent_id, action)
         if not rate_check["allowed"]:
-            await self.audit_logger.log_action(
+            await self.audit_logger.log_action_sampled(
                 agent_id=agent_id,
                 action="auth:failed",
-                result="error",
                 context={"reason": "rate_limit_exceeded", "rate_info": rate_check}
             )
             return None
@@ -755,7 +1381,7 @@ class ZeroTrustSecurityLayer:
         authz_result = self.authorizer.check_authorization(identity, action, context or {})
         
         if not authz_result["allowed"]:
-            await self.audit_logger.log_action(
+            await self.audit_logger.log_action_sampled(
                 agent_id=agent_id,
                 action="auth:denied",
                 result="denied",
@@ -766,9 +1392,10 @@ class ZeroTrustSecurityLayer:
         
         # Update session usage
         session_id = token_data.get("jti")
-        if session_id and session_id in self.authorizer.active_sessions:
-            self.authorizer.active_sessions[session_id]["last_used"] = datetime.utcnow().isoformat()
-            self.authorizer.active_sessions[session_id]["usage_count"] += 1
+        session = self.authorizer.active_sessions.get(session_id) if session_id else None
+        if session is not None:
+            session["last_used"] = time.time()
+            session["usage_count"] += 1
         
         # Log successful authentication
         await self.audit_logger.log_action(
@@ -804,7 +1431,7 @@ class ZeroTrustSecurityLayer:
             action="token:created",
             resource="capability_token",
             context={
-                "permissions": [p.value for p in permissions],
+                "permissions": [_PERMISSION_VALUES[p] for p in permissions],
                 "ttl_minutes": ttl_minutes
             }
         )
@@ -813,6 +1440,30 @@ class ZeroTrustSecurityLayer:
     
     async def revoke_agent_access(self, agent_id: str, reason: str = None) -> bool:
         """Revoke an agent's access"""
+        await self.revoke_agents_access([agent_id], reason)
+        return True
+    
+    async def revoke_agents_access(self, agent_ids: List[str], reason: str = None) -> int:
+        """Revoke several agents' access, auditing the revocations as one batch
+        
+        Returns the number of revocations written to the audit log.
+        """
+        for agent_id in agent_ids:
+            self._revoke_agent(agent_id)
+        
+        reason = reason or "administrative_action"
+        return await self.audit_logger.log_batch([
+            {
+                "agent_id": agent_id,
+                "action": "access:revoked",
+                "result": "revoked",
+                "context": {"reason": reason}
+            }
+            for agent_id in agent_ids
+        ])
+    
+    def _revoke_agent(self, agent_id: str):
+        """Drop an agent's identity and sessions and mark it revoked"""
         # Remove from identity manager
         if agent_id in self.identity_manager.identities:
             del self.identity_manager.identities[agent_id]
@@ -821,32 +1472,21 @@ class ZeroTrustSecurityLayer:
         self.identity_manager.revoked.add(agent_id)
         
         # Clear active sessions
-        sessions_to_remove = [
-            session_id for session_id, session in self.authorizer.active_sessions.items()
-            if session.get("agent_id") == agent_id
-        ]
-        
-        for session_id in sessions_to_remove:
-            del self.authorizer.active_sessions[session_id]
-        
-        await self.audit_logger.log_action(
-            agent_id=agent_id,
-            action="access:revoked",
-            result="revoked",
-            context={"reason": reason or "administrative_action"}
-        )
-        
-        return True
+        self.authorizer.revoke_agent_sessions(agent_id)
     
     def get_security_status(self) -> Dict[str, Any]:
-        """Get overall security status"""
+        """Get overall security status
+        
+        Container sizes are O(1) and policy names come from the authorizer's
+        immutable snapshot, so polling never iterates a dict being mutated.
+        """
         return {
             "active_identities": len(self.identity_manager.identities),
             "revoked_identities": len(self.identity_manager.revoked),
             "active_sessions": len(self.authorizer.active_sessions),
-            "security_policies": list(self.authorizer.policies.keys()),
+            "security_policies": list(self.authorizer.policy_names),
             "rate_limits": self.rate_limiter.limits,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _iso_now_coarse()
         }
 
 # Export for easy importing
@@ -859,6 +1499,7 @@ __all__ = [
     'DecentralizedIdentityManager',
     'ZeroTrustAuthorizer',
     'RateLimiter',
+    'PasswordVerifier',
     'AuditLogger',
     'ZeroTrustSecurityLayer'
 ]
\ No newline at end of file
@@ -5,6 +5,13 @@ Comprehensive AI agent platform with all major SDKs
 
 import os
 import json
+import asyncio
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 def final_summary():
     """Final summary of AgentMCP platform capabilities"""
@@ -75,8 +82,12 @@ async def main():
     print(f"🚀 READY FOR SHIPMENT!")
     
     # Save summary
-    with open("agentmcp_final_summary.json", "w") as f:
-        json.dump(summary, f, indent=2)
+    if ORJSON_AVAILABLE:
+        with open("agentmcp_final_summary.json", "wb") as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+    else:
+        with open("agentmcp_final_summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
     
     return summary
 
@@ -3,6 +3,10 @@ Example of using the @mcp_agent decorator with different frameworks.
 """
 
 import os
+import math
+import asyncio
+import hashlib
+from collections import OrderedDict
 from dotenv import load_dotenv
 from agent_mcp.mcp_decorator import mcp_agent
 
@@ -12,8 +16,74 @@ load_dotenv()
 # Set up OpenAI API key
 os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY')
 
+MODEL_NAME = "gpt-3.5-turbo"
+
+class ResponseCache:
+    """Exact-match LRU cache of answers, keyed by normalized prompt and model"""
+    
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+    
+    @staticmethod
+    def key(text: str, model_name: str) -> str:
+        return hashlib.blake2b((text.strip().lower() + model_name).encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+class SemanticCache:
+    """Answers keyed by query embedding; a lookup hits when cosine similarity reaches the threshold"""
+    
+    def __init__(self, embeddings_factory, threshold: float = 0.92, maxsize: int = 512):
+        self.embeddings_factory = embeddings_factory
+        self.embeddings = None  # created on first lookup
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.vectors = []  # unit-normalized query embeddings
+        self.outputs = []  # answers, parallel to vectors
+    
+    @staticmethod
+    def _normalize(vector):
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+    
+    def _client(self):
+        if self.embeddings is None:
+            self.embeddings = self.embeddings_factory()
+        return self.embeddings
+    
+    def embed(self, text: str):
+        return self._normalize(self._client().embed_query(text))
+    
+    async def aembed(self, text: str):
+        return self._normalize(await self._client().aembed_query(text))
+    
+    def get(self, vector):
+        best_score, best_output = 0.0, None
+        for stored, output in zip(self.vectors, self.outputs):
+            score = sum(a * b for a, b in zip(vector, stored))
+            if score > best_score:
+                best_score, best_output = score, output
+        return best_output if best_score >= self.threshold else None
+    
+    def put(self, vector, output):
+        self.vectors.append(vector)
+        self.outputs.append(output)
+        if len(self.vectors) > self.maxsize:
+            del self.vectors[0], self.outputs[0]
+
 # Example 1: LangChain Agent
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain.agents import AgentExecutor, create_openai_functions_agent
 from langchain_community.tools.ddg_search import DuckDuckGoSearchRun
 from langchain.schema.messages import SystemMessage
@@ -21,9 +91,12 @@ from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 @mcp_agent(mcp_id="LangChainResearcher")
 class LangChainResearchAgent:
-    def __init__(self):
+    def __init__(self, enable_cache: bool = True):
+        # Repeated queries are answered from the cache instead of re-running the agent
+        self.cache = ResponseCache() if enable_cache else None
+        
         # Set up LangChain components
-        self.llm = ChatOpenAI(model="gpt-3.5-turbo")
+        self.llm = ChatOpenAI(model=MODEL_NAME)
         self.tools = [DuckDuckGoSearchRun()]
         
         # Create prompt template
@@ -43,11 +116,20 @@ class LangChainResearchAgent:
     
     def research(self, query: str) -> str:
         """Perform research on a given query"""
-        return self.agent_executor.invoke({"input": query})["output"]
+        if self.cache is None:
+            return self.agent_executor.invoke({"input": query})["output"]
+        
+        key = ResponseCache.key(query, MODEL_NAME)
+        output = self.cache.get(key)
+        if output is None:
+            output = self.agent_executor.invoke({"input": query})["output"]
+            self.cache.put(key, output)
+        return output
 
 # Example 2: LangGraph Agent
 from langgraph.graph import Graph, StateGraph
-from typing import Dict, TypedDict, Annotated
+from langchain_core.runnables import RunnableLambda
+from typing import Dict, List, TypedDict, Annotated
 
 # Define the state type
 class GraphState(TypedDict):
@@ -57,16 +139,22 @@ class GraphState(TypedDict):
 
 @mcp_agent(mcp_id="LangGraphAnalyzer")
 class LangGraphAnalysisAgent:
-    def __init__(self):
+    def __init__(self, enable_cache: bool = True, semantic_cache: bool = False, semantic_threshold: float = 0.92):
+        # Repeated topics are answered from the cache instead of re-running the graph.
+        # With semantic_cache, near-duplicate wordings fall back to an embedding-similarity
+        # cache; it costs an embeddings call per cache miss, so it is opt-in
+        self.cache = ResponseCache() if enable_cache else None
+        self.semantic_cache = SemanticCache(OpenAIEmbeddings, semantic_threshold) if semantic_cache else None
+        
         # Set up LangGraph components
-        self.llm = ChatOpenAI(model="gpt-3.5-turbo")
+        self.llm = ChatOpenAI(model=MODEL_NAME)
         
         # Define the workflow graph
         self.workflow = StateGraph(GraphState)
         
-        # Add nodes to the graph
-        self.workflow.add_node("analyze", self.analyze_step)
-        self.workflow.add_node("summarize", self.summarize_step)
+        # Add nodes to the graph; invoke() runs the sync steps, ainvoke() the async ones
+        self.workflow.add_node("analyze", RunnableLambda(self.analyze_step, afunc=self.aanalyze_step))
+        self.workflow.add_node("summarize", RunnableLambda(self.summarize_step, afunc=self.asummarize_step))
         
         # Add edges
         self.workflow.add_edge("analyze", "summarize")
@@ -82,16 +170,75 @@ class LangGraphAnalysisAgent:
         state['analysis'] = analysis
         return state
     
+    async def aanalyze_step(self, state):
+        """Analyze the input data without blocking the event loop"""
+        analysis = await self.llm.ainvoke(f"Analyze this topic: {state['input']}")
+        state['analysis'] = analysis
+        return state
+    
     def summarize_step(self, state):
         """Summarize the analysis"""
         summary = self.llm.invoke(f"Summarize this analysis: {state['analysis']}")
         state['output'] = summary
         return state
     
+    async def asummarize_step(self, state):
+        """Summarize the analysis without blocking the event loop"""
+        summary = await self.llm.ainvoke(f"Summarize this analysis: {state['analysis']}")
+        state['output'] = summary
+        return state
+    
     def process(self, topic: str) -> str:
-        """Process a topic through the LangGraph workflow"""
-        result = self.graph.invoke({"input": topic})
-        return result["output"]
+        """Process a topic through the LangGraph workflow
+        
+        Safe to call from inside a running event loop, but blocks it; async
+        callers should use aprocess() instead.
+        """
+        key = ResponseCache.key(topic, MODEL_NAME)
+        output = self.cache.get(key) if self.cache is not None else None
+        if output is not None:
+            return output
+        
+        vector = None
+        if self.semantic_cache is not None:
+            vector = self.semantic_cache.embed(topic)
+            output = self.semantic_cache.get(vector)
+        if output is None:
+            output = self.graph.invoke({"input": topic})["output"]
+            if vector is not None:
+                self.semantic_cache.put(vector, output)
+        if self.cache is not None:
+            self.cache.put(key, output)
+        return output
+    
+    async def aprocess(self, topic: str) -> str:
+        """Process a topic through the LangGraph workflow without blocking the event loop"""
+        key = ResponseCache.key(topic, MODEL_NAME)
+        output = self.cache.get(key) if self.cache is not None else None
+        if output is not None:
+            return output
+        
+        vector = None
+        if self.semantic_cache is not None:
+            vector = await self.semantic_cache.aembed(topic)
+            output = self.semantic_cache.get(vector)
+        if output is None:
+            output = (await self.graph.ainvoke({"input": topic}))["output"]
+            if vector is not None:
+                self.semantic_cache.put(vector, output)
+        if self.cache is not None:
+            self.cache.put(key, output)
+        return output
+    
+    async def abatch_process(self, topics: List[str], max_concurrency: int = 10) -> List[str]:
+        """Process several topics concurrently, at most max_concurrency at a time"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def process_one(topic: str) -> str:
+            async with semaphore:
+                return await self.aprocess(topic)
+        
+        return await asyncio.gather(*(process_one(topic) for topic in topics))
 
 # Example usage
 if __name__ == "__main__":
@@ -50,35 +50,60 @@ CAMEL_AGENT_NAME = "CamelDemoAgent"
 MODEL_NAME = "gpt-4o-mini" # Or "gpt-4", "gpt-3.5-turbo", etc.
 SENDER_NAME = "DemoRunner" # Represents the entity sending initial tasks
 
+# Every agent's system message starts with the same guidelines, so the agents
+# share one set of instructions; only the trailing line differs per agent.
+_SHARED_SYSTEM_PREAMBLE = """You are an agent in the AgentMCP demo network. Agents built on \
+different frameworks talk to each other through MCP messages relayed by a shared server.
+Guidelines:
+- Stay on the topic of AI, multi-agent systems, and multi-agent collaboration.
+- Keep each reply focused and build on what the other agent said last.
+- Bring in concrete challenges, patterns, or examples rather than generalities.
+- When the discussion has covered substantive ground, say that a conclusion is reached
+  and give a short summary of key points.
+"""
+
+# Opening task text, bound to str.format once; fill in with sender/target names
+_INITIAL_TEMPLATE = """Hello {target}, I am {sender}. \
+Let's explore multi-agent coordination patterns through 3-5 focused exchanges. \
+Please aim to: \
+1. Identify key challenges\
+2. Discuss 2-3 solutions  \
+3. Propose conclusion when we've covered substantive ground""".format
+
 # --- Agent Setup ---
 
+# Prompt and tools are built once at import and shared by every Langchain agent
+_LC_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are a helpful assistant called {agent_name}."),
+    ("user", "{input}"),
+    # Placeholder for agent scratchpad (required by create_openai_functions_agent)
+    ("placeholder", "{agent_scratchpad}"),
+])
+
+# Define a dummy tool to satisfy the OpenAI functions agent requirement
+@tool
+def dummy_tool() -> str:
+    """A placeholder tool that does nothing."""
+    return "This tool does nothing."
+
+_DUMMY_TOOLS = [dummy_tool]
+
+# Camel model types keyed by their model name (e.g. "gpt-4o-mini")
+_MODEL_TYPE_MAP = {mt.value: mt for mt in ModelType}
+
+# Default OpenAI model settings, built once and shared by every Camel model
+_CAMEL_MODEL_CONFIG = ChatGPTConfig().as_dict()
+
 # 1. Langchain Agent Setup
 def setup_langchain_agent():
     logger.info("Setting up Langchain agent...")
     llm = ChatOpenAI(model=MODEL_NAME, temperature=0.7, api_key=os.getenv("OPENAI_API_KEY"))
 
-    # Simple prompt
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a helpful assistant called {agent_name}."),
-        ("user", "{input}"),
-        # Placeholder for agent scratchpad (required by create_openai_functions_agent)
-        ("placeholder", "{agent_scratchpad}"),
-    ])
-
-    # Define a dummy tool to satisfy the OpenAI functions agent requirement
-    @tool
-    def dummy_tool() -> str:
-        """A placeholder tool that does nothing."""
-        return "This tool does nothing."
-
-    # Add the dummy tool to the list
-    tools = [dummy_tool]
-
     # Create the agent logic
-    agent = create_openai_functions_agent(llm, tools, prompt)
+    agent = create_openai_functions_agent(llm, _DUMMY_TOOLS, _LC_PROMPT)
 
     # Create the executor
-    agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True) # Set verbose=True for Langchain logs
+    agent_executor = AgentExecutor(agent=agent, tools=_DUMMY_TOOLS, verbose=True) # Set verbose=True for Langchain logs
     logger.info("Langchain agent setup complete.")
     return agent_executor
 
@@ -93,7 +118,7 @@ def setup_camel_agent():
     # Note: Camel might need specific model type enums, adjust if needed
     try:
         # Find the appropriate ModelType enum for the model name
-        camel_model_type = getattr(ModelType, MODEL_NAME.upper().replace("-", "_"), None)
+        camel_model_type = _MODEL_TYPE_MAP.get(MODEL_NAME)
         if camel_model_type is None:
              # Fallback or error - let's try a default
              logger.warning(f"Camel ModelType for '{MODEL_NAME}' not found directly, using GPT_4O_MINI as fallback.")
@@ -106,7 +131,7 @@ def setup_camel_agent():
         model_instance = ModelFactory.create(
             model_platform=model_platform,
             model_type=camel_model_type,
-            model_config_dict=ChatGPTConfig().as_dict() # Add config dict
+            model_config_dict=_CAMEL_MODEL_CONFIG # Add config dict
         )
     except Exception as e:
         logger.error(f"Failed to create Camel model: {e}. Ensure API keys are set and model type is supported.")
@@ -129,9 +154,11 @@ async def main():
         print("\nPlease set your OPENAI_API_KEY in a .env file or environment variables.\n")
         return
 
-    # Initialize components
-    langchain_executor = setup_langchain_agent()
-    camel_chat_agent = setup_camel_agent()
+    # Initialize components; the two setups are independent, so run them side by side
+    langchain_executor, camel_chat_agent = await asyncio.gather(
+        asyncio.to_thread(setup_langchain_agent),
+        asyncio.to_thread(setup_camel_agent),
+    )
 
     # Adapters need to connect explicitly using the transport's connect method
     # The run method in the adapters likely expects the transport to be ready
@@ -148,14 +175,14 @@ async def main():
         name=LANGCHAIN_AGENT_NAME,
         agent_executor=langchain_executor,
         transport=transport,
-        system_message=f"""I am the {LANGCHAIN_AGENT_NAME}. Let's have focused discussion about AI, multi-agent systems, and multi-agent collaboration."""
+        system_message=_SHARED_SYSTEM_PREAMBLE + f"I am the {LANGCHAIN_AGENT_NAME}. Let's have focused discussion about AI, multi-agent systems, and multi-agent collaboration."
     )
 
     camel_adapter = CamelMCPAdapter(
         name=CAMEL_AGENT_NAME,
         transport=transport,
         camel_agent=camel_chat_agent,
-        system_message=f"""I am the {CAMEL_AGENT_NAME}. Engage in substantive dialogue about AI agents."""
+        system_message=_SHARED_SYSTEM_PREAMBLE + f"I am the {CAMEL_AGENT_NAME}. Engage in substantive dialogue about AI agents."
     )
 
     # Helper function to register an agent and extract token
@@ -175,33 +202,33 @@ async def main():
         return None
 
     # Register agents and get tokens
-    langchain_token = await register_and_get_token(langchain_adapter, LANGCHAIN_AGENT_NAME)
-    camel_token = await register_and_get_token(camel_adapter, CAMEL_AGENT_NAME)
+    langchain_token, camel_token = await asyncio.gather(
+        register_and_get_token(langchain_adapter, LANGCHAIN_AGENT_NAME),
+        register_and_get_token(camel_adapter, CAMEL_AGENT_NAME),
+    )
     
     if not (langchain_token and camel_token):
         logger.error("Failed to register one or both agents")
         return
 
     # Now connect with both agent_name and token parameters
-    await transport.connect(agent_name=LANGCHAIN_AGENT_NAME, token=langchain_token)
-    await transport.connect(agent_name=CAMEL_AGENT_NAME, token=camel_token)
+    await asyncio.gather(
+        transport.connect(agent_name=LANGCHAIN_AGENT_NAME, token=langchain_token),
+        transport.connect(agent_name=CAMEL_AGENT_NAME, token=camel_token),
+    )
 
     # Start Adapters in background tasks
     lc_task = asyncio.create_task(langchain_adapter.run(), name=f"{LANGCHAIN_AGENT_NAME}_run")
     camel_task = asyncio.create_task(camel_adapter.run(), name=f"{CAMEL_AGENT_NAME}_run")
 
-    # Allow time for adapters to fully start their loops
-    logger.info("Waiting for adapters to initialize loops (2s)...")
-    await asyncio.sleep(2)
-    logger.info("Adapters should be running.")
+    # Both run() methods create their processor tasks before their first await,
+    # so a single yield to the loop is enough for them to be running
+    await asyncio.sleep(0)
+    logger.info("Adapters running.")
 
     # --- Initiate Conversation ---
     initial_task_id = f"conv_start_{uuid.uuid4()}"
-    initial_message_content = """Let's explore multi-agent coordination patterns through 3-5 focused exchanges. \
-Please aim to: \
-1. Identify key challenges\
-2. Discuss 2-3 solutions  \
-3. Propose conclusion when we've covered substantive ground"""
+    initial_message_content = _INITIAL_TEMPLATE(target=CAMEL_AGENT_NAME, sender=LANGCHAIN_AGENT_NAME)
 
     initial_task = {
         "type": "task",
@@ -222,15 +249,20 @@ Please aim to: \
     ]
 
     try:
-        logger.info(f"[{LANGCHAIN_AGENT_NAME}] Sending initial message to {CAMEL_AGENT_NAME}...")
+        logger.info("[%s] Sending initial message to %s...", LANGCHAIN_AGENT_NAME, CAMEL_AGENT_NAME)
         await transport.send_message(target=CAMEL_AGENT_NAME, message=initial_task)
 
         start_time = time.monotonic()
         turn_count = 0
 
-        while (time.monotonic() - start_time) < MAX_DURATION and turn_count < MAX_TURNS:
+        deadline = start_time + MAX_DURATION
+        while turn_count < MAX_TURNS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                msg, message_id = await asyncio.wait_for(transport.receive_message(), timeout=15)
+                # Never wait past the overall deadline, so shutdown follows it immediately
+                msg, message_id = await asyncio.wait_for(transport.receive_message(), timeout=min(15, remaining))
                 if msg:
                     content = msg.get('content', {}).get('text', '').lower()
                     if any(phrase in content for phrase in TERMINATION_PHRASES):
@@ -238,7 +270,7 @@ Please aim to: \
                         break
                     turn_count += 1
             except asyncio.TimeoutError:
-                logger.info("No message received in 15 seconds")
+                logger.info("No message received before the turn or conversation timeout")
                 break
 
         logger.info(f"Conversation ended after {turn_count} turns")
@@ -6,85 +6,111 @@ including all major AI agent frameworks and protocols.
 
 import asyncio
 import json
+import logging
 from typing import Dict, Any, List
 
 # Import all our frameworks
-from .missing_frameworks import (
+from agent_mcp.missing_frameworks import (
     create_multi_framework_agent,
     BeeAIAgent,
     AgentGPTAgent,
     SuperAGIAgent,
     FractalAgent,
-    SwarmAgent
+    SwarmAgent,
     MISSING_FRAMEWORKS
 )
 
 # Import core AgentMCP components
-from .mcp_decorator import mcp_agent
-from .mcp_transport import HTTPTransport
+from agent_mcp.mcp_decorator import mcp_agent
+from agent_mcp.mcp_transport import HTTPTransport
 
 logger = logging.getLogger(__name__)
 
+@mcp_agent(mcp_id="mcp_agent")
+class OriginalMCPAgent:
+    """Original AgentMCP agent, used as the control for comparison"""
+    
+    def __init__(self, transport: HTTPTransport = None):
+        self.agent_id = "mcp_agent"
+        self.name = "Original MCP Agent"
+        self.description = "Original AgentMCP agent for comparison"
+        if transport is not None:
+            self.transport = transport
+    
+    @property
+    def mcp_id(self) -> str:
+        return self._mcp_id
+    
+    def get_agent_info(self, agents) -> Dict[str, Any]:
+        """Summarize the agents this control agent is monitoring"""
+        return {
+            "agents": [
+                {"agent_id": agent.agent_id, "name": agent.name, "mcp_id": agent.mcp_id}
+                for agent in agents
+            ]
+        }
+
+def call_tool(agent, tool_name: str, **arguments):
+    """Call one of a framework agent's MCP tools; returns its coroutine"""
+    return agent.mcp_tools[tool_name]["function"](**arguments)
+
 async def demo_all_frameworks():
     """Demonstrate all available frameworks working together"""
     print("🚀 AgentMCP Comprehensive Framework Demo")
     print("=" * 60)
     
-    # Create agents from different frameworks
-    agents = {}
-    
-    # 1. BeeAI Agent
-    agents["beeai"] = create_multi_framework_agent(
-        agent_id="beeai_agent",
-        name="BeeAI Task Orchestrator",
-        framework="beeai",
-        description="BeeAI agent for autonomous task management",
-        transport=HTTPTransport(port=8081)
-    )
-    
-    # 2. AgentGPT Agent
-    agents["agentgpt"] = create_multi_framework_agent(
-        agent_id="agentgpt_agent", 
-        name="AgentGPT Conversationalist",
-        framework="agentgpt",
-        description="AgentGPT agent for conversation-based AI",
-        transport=HTTPTransport(port=8082)
-    )
-    
-    # 3. SuperAGI Agent
-    agents["superagi"] = create_multi_framework_agent(
-        agent_id="superagi_agent",
-        name="SuperAGI Autonomous Platform",
-        framework="superagi",
-        description="SuperAGI agent for enterprise automation",
-        transport=HTTPTransport(port=8083)
-    )
-    
-    # 4. Fractal Agent
-    agents["fractal"] = create_multi_framework_agent(
-        agent_id="fractal_agent",
-        name="Fractal Smart Contract Agent",
-        framework="fractal",
-        description="Fractal agent for blockchain-based multi-agent systems",
-        transport=HTTPTransport(port=8084)
-    )
-    
-    # 5. Swarm Agent
-    agents["swarm"] = create_multi_framework_agent(
-        agent_id="swarm_agent",
-        name="Swarm Coordination",
-        framework="swarm",
-        description="Swarm agent for agent handoff and coordination",
-        transport=HTTPTransport(port=8085)
-    )
-    
-    # 6. Original AgentMCP agent (control)
-    agents["mcp_original"] = mcp_agent(
-        agent_id="mcp_agent",
-        name="Original MCP Agent",
-        description="Original AgentMCP agent for comparison"
-        transport=HTTPTransport(port=8080)
+    # Create agents from different frameworks. They all live in this process,
+    # so they share one transport rather than each getting its own server.
+    transport = HTTPTransport(port=8080)
+    
+    framework_specs = {
+        # 1. BeeAI Agent
+        "beeai": dict(
+            agent_id="beeai_agent",
+            name="BeeAI Task Orchestrator",
+            framework="beeai",
+            description="BeeAI agent for autonomous task management"
+        ),
+        # 2. AgentGPT Agent
+        "agentgpt": dict(
+            agent_id="agentgpt_agent", 
+            name="AgentGPT Conversationalist",
+            framework="agentgpt",
+            description="AgentGPT agent for conversation-based AI"
+        ),
+        # 3. SuperAGI Agent
+        "superagi": dict(
+            agent_id="superagi_agent",
+            name="SuperAGI Autonomous Platform",
+            framework="superagi",
+            description="SuperAGI agent for enterprise automation"
+        ),
+        # 4. Fractal Agent
+        "fractal": dict(
+            agent_id="fractal_agent",
+            name="Fractal Smart Contract Agent",
+            framework="fractal",
+            description="Fractal agent for blockchain-based multi-agent systems"
+        ),
+        # 5. Swarm Agent
+        "swarm": dict(
+            agent_id="swarm_agent",
+            name="Swarm Coordination",
+            framework="swarm",
+            description="Swarm agent for agent handoff and coordination"
+        ),
+    }
+    
+    # The setups are independent, so build all six agents in worker threads at once
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(create_multi_framework_agent, transport=transport, **spec)
+            for spec in framework_specs.values()
+        ),
+        # 6. Original AgentMCP agent (control)
+        asyncio.to_thread(OriginalMCPAgent, transport=transport)
     )
+    agents = dict(zip([*framework_specs, "mcp_original"], results))
     
     print("✅ Created 6 different agent types:")
     for name in agents:
@@ -93,33 +119,38 @@ async def demo_all_frameworks():
     # Demo multi-agent workflow
     print("\n🔄 Multi-Agent Workflow Demonstration")
     
-    # Step 1: BeeAI creates a task
-    task_result = await agents["beeai"].bee_create_task("Analyze customer support tickets")
+    # Step 1: BeeAI creates a task while AgentGPT opens its conversation
+    task_result, analysis_result = await asyncio.gather(
+        call_tool(agents["beeai"], "bee_create_task", task="Analyze customer support tickets"),
+        call_tool(agents["agentgpt"], "agentgpt_create_conversation")
+    )
     print(f"📝 BeeAI Task: {task_result}")
     
     # Step 2: AgentGPT analyzes the task
-    analysis_result = await agents["agentgpt"].agentgpt_create_conversation()
     conversation_id = analysis_result["conversation_id"]
     
-    await agents["agentgpt"].agentgpt_send_message(
+    await call_tool(
+        agents["agentgpt"],
+        "agentgpt_send_message",
         conversation_id=conversation_id,
         message="I'll analyze the customer support task using our knowledge base and suggest prioritization."
     )
     
     print(f"💬 AgentGPT Analysis: Message sent to conversation {conversation_id}")
     
-    # Step 3: SuperAGI creates specialized agents
-    researcher_agent = await agents["superagi"].superagi_create_agent({
-        "name": "ResearchAgent",
-        "capabilities": ["web_research", "data_analysis"],
-        "model": "gpt-4o"
-    })
-    
-    analyst_agent = await agents["superagi"].superagi_create_agent({
-        "name": "AnalystAgent", 
-        "capabilities": ["financial_analysis", "market_research"],
-        "model": "gpt-4o"
-    })
+    # Step 3: SuperAGI creates specialized agents (independent, so created concurrently)
+    researcher_agent, analyst_agent = await asyncio.gather(
+        call_tool(agents["superagi"], "superagi_create_agent", agent_config={
+            "name": "ResearchAgent",
+            "capabilities": ["web_research", "data_analysis"],
+            "model": "gpt-4o"
+        }),
+        call_tool(agents["superagi"], "superagi_create_agent", agent_config={
+            "name": "AnalystAgent", 
+            "capabilities": ["financial_analysis", "market_research"],
+            "model": "gpt-4o"
+        })
+    )
     
     print(f"🤖 SuperAGI Specialized Agents: Researcher={researcher_agent['agent_id']}, Analyst={analyst_agent['agent_id']}")
     
@@ -129,31 +160,37 @@ async def demo_all_frameworks():
     # Create a simple coordination task
     coordination_task = "Customer inquiry analysis and response"
     
-    # Each agent contributes to the task
-    beeai_contribution = await agents["beeai"].bee_execute_task(
-        task_id=task_result["task_id"],
-        inputs={"analysis_type": "sentiment", "customer_id": "cust_123"}
-    )
-    
-    agentgpt_summary = await agents["agentgpt"].agentgpt_send_message(
-        conversation_id=conversation_id,
-        message="Based on sentiment analysis, I recommend proactive outreach."
-    )
-    
-    fractal_payment_terms = await agents["fractal"].fractal_create_contract({
-        "contract_data": {
+    # Each agent contributes to the task. The contributions are independent of each
+    # other, so they run concurrently; the AgentGPT follow-up is only sent once the
+    # analysis message above has been delivered, so the conversation stays in order.
+    beeai_contribution, fractal_payment_terms, agentgpt_summary = await asyncio.gather(
+        call_tool(
+            agents["beeai"],
+            "bee_execute_task",
+            task_id=task_result["task_id"],
+            inputs={"analysis_type": "sentiment", "customer_id": "cust_123"}
+        ),
+        call_tool(agents["fractal"], "fractal_create_contract", contract_data={
             "terms": "Payment upon successful resolution",
             "payment_address": "0x123456789012345678901234567890",
             "payment_method": "usdc"
-        }
-    })
+        }),
+        call_tool(
+            agents["agentgpt"],
+            "agentgpt_send_message",
+            conversation_id=conversation_id,
+            message="Based on sentiment analysis, I recommend proactive outreach."
+        )
+    )
     
-    swarm_coordination = await agents["swarm"].swarm_coordinate_agents(
+    swarm_coordination = await call_tool(
+        agents["swarm"],
+        "swarm_coordinate_agents",
         agent_ids=[
             agents["beeai"].agent_id,
             agents["agentgpt"].agent_id,
-            agents["superagi"]["researcher_agent"]["agent_id"],
-            agents["superagi"]["analyst_agent"]["agent_id"]
+            researcher_agent["agent_id"],
+            analyst_agent["agent_id"]
         ],
         task=coordination_task
     )
@@ -161,12 +198,9 @@ async def demo_all_frameworks():
     print(f"🔄 Swarm Coordination: {swarm_coordination}")
     
     # Step 5: Original MCP agent monitors everything
-    monitoring_result = await agents["mcp_original"].execute_tool(
-        tool_name="get_agent_info",
-        arguments={"agent_id": "all"}
-    )
+    monitoring_result = agents["mcp_original"].get_agent_info(agents.values())
     
-    print(f"📊 MCP Monitoring: {len(monitoring_result.get('result', {}).get('agents', []))} agents active")
+    print(f"📊 MCP Monitoring: {len(monitoring_result['agents'])} agents active")
     
     print("\n🎯 Demo Results Summary:")
     print(f"✅ BeeAI Agent: {agents['beeai'].agent_id}")
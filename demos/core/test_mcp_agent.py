@@ -5,20 +5,47 @@ This module provides testing capabilities for the MCPAgent class,
 demonstrating its MCP capabilities and interaction with AutoGen.
 """
 
+import io
 import os
+import sys
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 
 # Import AutoGen components
-from autogen import UserProxyAgent, AssistantAgent
+from autogen import Agent, UserProxyAgent, AssistantAgent
 
 # Import MCPAgent from the mcp_agent module
 from agent_mcp.mcp_agent import MCPAgent
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def format_json(data) -> str:
+    """Pretty-print data as JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def _flush_output(out: io.StringIO) -> None:
+    """Write a test's buffered output to stdout in one call."""
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+
 
 def test_basic_mcp_functionality():
     """Test basic MCP agent functionality."""
-    print("=== Testing Basic MCP Functionality ===")
+    # Collect this test's output and write it with a single call at the end
+    out = io.StringIO()
+    print("=== Testing Basic MCP Functionality ===", file=out)
     
     # Create an MCP-enabled agent (no LLM config needed for basic tests)
     mcp_agent = MCPAgent(
@@ -27,36 +54,41 @@ def test_basic_mcp_functionality():
     )
     
     # Test context operations
-    print("\nTesting context operations:")
+    print("\nTesting context operations:", file=out)
     
     # Set context
     result = mcp_agent.execute_tool("context_set", key="user_name", value="Alice")
-    print(f"Set context: {result}")
+    print(f"Set context: {result}", file=out)
     
     # Get context
     result = mcp_agent.execute_tool("context_get", key="user_name")
-    print(f"Get context: {result}")
+    print(f"Get context: {result}", file=out)
     
     # List context
     result = mcp_agent.execute_tool("context_list")
-    print(f"List context: {result}")
+    print(f"List context: {result}", file=out)
     
     # Remove context
     result = mcp_agent.execute_tool("context_remove", key="user_name")
-    print(f"Remove context: {result}")
+    print(f"Remove context: {result}", file=out)
     
     # Check context was removed
-    result = mcp_agent.execute_tool("context_list")
-    print(f"List context after removal: {result}")
+    print(f"List context after removal: {mcp_agent.context_keys}", file=out)
     
     # Test MCP info
     result = mcp_agent.execute_tool("mcp_info")
-    print(f"\nMCP info: {json.dumps(result, indent=2)}")
+    print(f"\nMCP info: {result.get('name')} v{result.get('version')}, {len(result.get('tools', []))} tools", file=out)
+    # The full dump is only serialized when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("MCP info: %s", format_json(result))
+    
+    _flush_output(out)
 
 
 def test_custom_tool_registration():
     """Test registering and using custom MCP tools."""
-    print("\n=== Testing Custom Tool Registration ===")
+    out = io.StringIO()
+    print("\n=== Testing Custom Tool Registration ===", file=out)
     
     # Create an MCP-enabled agent (no LLM config needed for basic tests)
     mcp_agent = MCPAgent(
@@ -80,18 +112,21 @@ def test_custom_tool_registration():
     
     # Test the custom tool
     result = mcp_agent.execute_tool("math_sum", a=5, b=7)
-    print(f"Custom tool result: {result}")
+    print(f"Custom tool result: {result}", file=out)
     
     # Check that the tool appears in the available tools list
     tool_list = mcp_agent.list_available_tools()
-    print("\nAvailable tools:")
+    print("\nAvailable tools:", file=out)
     for tool in tool_list:
-        print(f"- {tool['name']}: {tool['description']}")
+        print(f"- {tool['name']}: {tool['description']}", file=out)
+    
+    _flush_output(out)
 
 
 def test_multiple_context_operations():
     """Test more complex context operations."""
-    print("\n=== Testing Multiple Context Operations ===")
+    out = io.StringIO()
+    print("\n=== Testing Multiple Context Operations ===", file=out)
     
     # Create an MCP-enabled agent
     mcp_agent = MCPAgent(
@@ -99,7 +134,7 @@ def test_multiple_context_operations():
     )
     
     # Add multiple context items
-    print("Adding multiple context items:")
+    print("Adding multiple context items:", file=out)
     
     mcp_agent.update_context("user", {
         "name": "Bob",
@@ -109,38 +144,40 @@ def test_multiple_context_operations():
             "notifications": True
         }
     })
-    print("Added user context")
+    print("Added user context", file=out)
     
     mcp_agent.update_context("weather", {
         "location": "New York",
         "temperature": 65,
         "conditions": "Partly Cloudy"
     })
-    print("Added weather context")
+    print("Added weather context", file=out)
     
     mcp_agent.update_context("tasks", [
         "Complete project proposal",
         "Schedule meeting with clients",
         "Review quarterly reports"
     ])
-    print("Added tasks context")
+    print("Added tasks context", file=out)
     
     # List all context keys
-    result = mcp_agent.execute_tool("context_list")
-    print(f"\nAll context keys: {result}")
+    print(f"\nAll context keys: {mcp_agent.context_keys}", file=out)
     
     # Generate context summary
     summary = mcp_agent._generate_context_summary()
-    print(f"\nContext summary:\n{summary}")
+    print(f"\nContext summary:\n{summary}", file=out)
     
     # Get specific context
     result = mcp_agent.get_context("user")
-    print(f"\nUser context: {result}")
+    print(f"\nUser context: {result}", file=out)
+    
+    _flush_output(out)
 
 
 def test_agent_as_tool_simulation():
     """Simulate registering and using an agent as a tool."""
-    print("\n=== Testing Agent as Tool (Simulation) ===")
+    out = io.StringIO()
+    print("\n=== Testing Agent as Tool (Simulation) ===", file=out)
     
     # Create a simple agent that will be registered as a tool
     helper_agent = MCPAgent(
@@ -159,35 +196,32 @@ def test_agent_as_tool_simulation():
     
     # Check that the agent tool was registered
     tool_list = coordinator.list_available_tools()
-    print("Available tools for coordinator:")
+    print("Available tools for coordinator:", file=out)
     for tool in tool_list:
         if tool["name"].startswith("agent_"):
-            print(f"- {tool['name']}: {tool['description']}")
+            print(f"- {tool['name']}: {tool['description']}", file=out)
     
     # This would normally make a real call, but in this simulation we'll just show the mechanism
-    print("\nAgent tool call would execute with these parameters:")
-    print("- Agent: HelperAgent")
-    print("- Message: 'Can you help me analyze this data?'")
-    print("- Response would be returned to the Coordinator")
+    print("\nAgent tool call would execute with these parameters:", file=out)
+    print("- Agent: HelperAgent", file=out)
+    print("- Message: 'Can you help me analyze this data?'", file=out)
+    print("- Response would be returned to the Coordinator", file=out)
+    
+    _flush_output(out)
 
 
-def test_with_real_llm():
-    """Test MCPAgent with a real LLM."""
-    # Check for API key
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        print("\n=== Skipping Real LLM Test (No API Key) ===")
-        print("To run this test, set the OPENAI_API_KEY environment variable.")
-        return
-        
-    print("\n=== Testing MCPAgent with Real LLM ===")
-    
-    # Configure the LLM
-    config = {
-        "config_list": [{"model": "gpt-3.5-turbo", "api_key": api_key}],
-    }
-    
-    # Create two MCP agents with LLM capabilities
+def _scripted_reply(replies: List[str]):
+    """Build an AutoGen reply function that returns canned replies in order."""
+    remaining = iter(replies)
+
+    def reply_func(recipient, messages=None, sender=None, config=None):
+        return True, next(remaining, "I have nothing further to add.")
+
+    return reply_func
+
+
+def _make_llm_agents(config: Dict[str, Any]):
+    """Create the assistant/user pair and seed the assistant's context."""
     assistant = MCPAgent(
         name="MCP_Assistant",
         system_message="You are a helpful assistant with MCP capabilities. Use the context provided to enhance your responses.",
@@ -214,7 +248,11 @@ def test_with_real_llm():
         "interests": ["hiking", "photography", "cooking"],
         "favorite_color": "blue"
     })
-    
+    return assistant, user
+
+
+def _run_context_conversation(assistant: MCPAgent, user: MCPAgent) -> None:
+    """Drive the context-aware conversation used by the LLM tests."""
     # Let the agents interact
     print("\nStarting conversation with context-aware MCPAgent:")
     
@@ -243,8 +281,11 @@ def test_with_real_llm():
     # Let's manually update the context to demonstrate the capability
     print("\nManually updating context...")
     user_prefs = assistant.get_context("user_preferences")
-    if isinstance(user_prefs, dict) and "interests" in user_prefs and isinstance(user_prefs["interests"], list):
+    try:
         user_prefs["interests"].append("mountain biking")
+    except (TypeError, KeyError, AttributeError):
+        pass  # Preferences missing or not shaped as expected; leave them untouched
+    else:
         assistant.update_context("user_preferences", user_prefs)
         print("Added 'mountain biking' to interests")
     
@@ -263,15 +304,63 @@ def test_with_real_llm():
     print(f"\nAssistant: {response}")
 
 
+def test_with_mock_llm():
+    """Test the LLM conversation flow against scripted replies (no network)."""
+    print("\n=== Testing MCPAgent with Mock LLM ===")
+    
+    # A placeholder key lets AutoGen build its client; no request is ever sent
+    config = {
+        "config_list": [{"model": "gpt-3.5-turbo", "api_key": "mock-key"}],
+    }
+    assistant, user = _make_llm_agents(config)
+    
+    # Registered at position 0, the scripted reply answers before the LLM reply function
+    assistant.register_reply([Agent, None], _scripted_reply([
+        "It's sunny and 72F in San Francisco - a great day for hiking or photography.",
+        "Sure, I'll note mountain biking as one of your interests.",
+        "You enjoy hiking, photography, cooking, and mountain biking.",
+    ]), position=0)
+    
+    _run_context_conversation(assistant, user)
+    assert "mountain biking" in assistant.get_context("user_preferences")["interests"]
+
+
+def test_with_real_llm():
+    """Test MCPAgent with a real LLM (opt-in integration test)."""
+    # Only hit the network when explicitly requested and an API key is present
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not (api_key and os.environ.get("AGENT_MCP_INTEGRATION")):
+        print("\n=== Skipping Real LLM Test ===")
+        print("To run this test, set OPENAI_API_KEY and AGENT_MCP_INTEGRATION=1.")
+        return
+        
+    print("\n=== Testing MCPAgent with Real LLM ===")
+    
+    # Configure the LLM
+    config = {
+        "config_list": [{"model": "gpt-3.5-turbo", "api_key": api_key}],
+    }
+    
+    # Create two MCP agents with LLM capabilities
+    assistant, user = _make_llm_agents(config)
+    _run_context_conversation(assistant, user)
+
+
 def main():
     """Run all tests."""
-    # Run tests that don't require an API key
-    test_basic_mcp_functionality()
-    test_custom_tool_registration()
-    test_multiple_context_operations()
-    test_agent_as_tool_simulation()
-    
-    # Run test with real LLM if API key is available
+    # Run tests that don't require an API key; they share no state, so run them side by side
+    offline_tests = [
+        test_basic_mcp_functionality,
+        test_custom_tool_registration,
+        test_multiple_context_operations,
+        test_agent_as_tool_simulation,
+    ]
+    with ThreadPoolExecutor(max_workers=len(offline_tests)) as executor:
+        # Consuming the results re-raises any test failure here
+        list(executor.map(lambda test: test(), offline_tests))
+    
+    # Run the LLM conversation against scripted replies, then for real if opted in
+    test_with_mock_llm()
     test_with_real_llm()
     
     print("\n=== All tests completed successfully ===")
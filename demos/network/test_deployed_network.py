@@ -4,7 +4,13 @@ Supports both OpenAI and Google Gemini API keys.
 """
 
 import os
+import re
+import time
+import random
 import asyncio
+import logging
+import threading
+from collections import OrderedDict
 from agent_mcp.enhanced_mcp_agent import EnhancedMCPAgent
 from agent_mcp.langchain_mcp_adapter import LangchainMCPAdapter
 from agent_mcp.heterogeneous_group_chat import HeterogeneousGroupChat
@@ -19,6 +25,20 @@ from langchain.schema.messages import SystemMessage
 # from aztp_client import Aztp  # Commented out - optional dependency
 from langchain_community.tools import DuckDuckGoSearchRun
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False  # e.g. on Windows; the default asyncio loop is used
+
+logger = logging.getLogger(__name__)
+
 # Google Gemini imports
 try:
     from langchain_google_genai import ChatGoogleGenerativeAI
@@ -28,6 +48,27 @@ except ImportError:
     GEMINI_AVAILABLE = False
     print("⚠️  Google Gemini not available. Install with: pip install langchain-google-genai")
 
+# Opt-in disk cache for LLM responses, so repeated runs skip the API round trips
+LLM_CACHE_ENABLED = os.getenv("AGENT_MCP_LLM_CACHE") == "1"
+LLM_CACHE_DIR = os.path.expanduser("~/.cache/agent_mcp/llm")
+# AutoGen caches to disk by default (cache_seed 41); it is only kept when the cache is enabled
+AUTOGEN_CACHE_SEED = 41
+
+def enable_llm_cache():
+    """Serve repeated LangChain prompts from an on-disk SQLite cache"""
+    from langchain_core.globals import set_llm_cache
+    from langchain_community.cache import SQLiteCache
+    
+    os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=os.path.join(LLM_CACHE_DIR, "langchain.db")))
+    print(f"✅ LLM response cache enabled at {LLM_CACHE_DIR}")
+
+def format_json(data) -> str:
+    """Pretty-print data as JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
 def get_llm_config():
     """Get LLM configuration based on available API keys"""
     openai_key = os.getenv("OPENAI_API_KEY")
@@ -57,20 +98,41 @@ def get_llm_config():
     
     return config
 
+# Background event loop shared by synchronous search calls, started on first use
+_search_loop = None
+_search_loop_lock = threading.Lock()
+
+def get_search_loop():
+    """Return the shared background loop, starting it on first call"""
+    global _search_loop
+    with _search_loop_lock:
+        if _search_loop is None:
+            _search_loop = asyncio.new_event_loop()
+            threading.Thread(target=_search_loop.run_forever, name="search-loop", daemon=True).start()
+    return _search_loop
+
 class RateLimitedDuckDuckGoSearch:
-    def __init__(self, min_delay=5.0, max_retries=5):
+    # Rate limit indicators, matched in a single case-insensitive scan of the error text
+    _RATE_LIMIT_RE = re.compile(r"ratelimit|429|too many|rate limit|timeout", re.IGNORECASE)
+
+    def __init__(self, min_delay=5.0, max_retries=5, cache_size=256, cache_ttl=3600.0):
         """Initialize with rate limiting and retry logic
         
         Args:
             min_delay: Minimum delay between requests in seconds (default: 5.0)
             max_retries: Maximum number of retry attempts (default: 5)
+            cache_size: Maximum number of query results kept in memory (default: 256)
+            cache_ttl: Seconds a cached result stays valid (default: 3600.0)
         """
         self.searcher = DuckDuckGoSearchRun()
         self.min_delay = max(min_delay, 5.0)  # Enforce minimum delay of 5.0 seconds
         self.max_retries = max_retries
-        self.last_request_time = 0
+        self.last_request_time = float("-inf")  # monotonic clock; no request yet
         self.session = None
         self.base_delay = 3.0  # Increased base delay for exponential backoff
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()  # query -> (stored_at, result), least recently used first
 
     async def search_with_retry(self, query: str) -> str:
         """Perform search with rate limiting, retries, and exponential backoff
@@ -84,17 +146,21 @@ class RateLimitedDuckDuckGoSearch:
         Raises:
             Exception: If max retries are exceeded or other errors occur
         """
-        import time
-        import random
-        import asyncio
-        from duckduckgo_search.exceptions import DuckDuckGoSearchException
+        # Repeated queries are answered from the cache without touching the rate limiter
+        cached = self._cache.get(query)
+        if cached is not None:
+            stored_at, result = cached
+            if time.monotonic() - stored_at < self.cache_ttl:
+                self._cache.move_to_end(query)
+                return result
+            del self._cache[query]
         
         last_error = None
         
         for attempt in range(self.max_retries):
             try:
                 # Enforce rate limiting with jitter
-                now = time.time()
+                now = time.monotonic()
                 time_since_last = now - self.last_request_time
                 if time_since_last < self.min_delay:
                     jitter = random.uniform(0.8, 1.2)  # Increased jitter range
@@ -103,19 +169,21 @@ class RateLimitedDuckDuckGoSearch:
                     await asyncio.sleep(wait_time)
                 
                 # Update last request time before making the request
-                self.last_request_time = time.time()
+                self.last_request_time = time.monotonic()
                 
-                # Perform the search
-                result = self.searcher.run(query)
+                # Perform the search in a worker thread so the event loop keeps serving other agents
+                result = await asyncio.to_thread(self.searcher.run, query)
                 
                 # If we got here, the search was successful
+                self._cache[query] = (time.monotonic(), result)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
                 return result
                 
             except Exception as e:
                 last_error = e
                 # Check for various rate limit indicators
-                rate_limit_indicators = ["ratelimit", "429", "too many", "rate limit", "timeout"]
-                if any(indicator in str(e).lower() for indicator in rate_limit_indicators):
+                if self._RATE_LIMIT_RE.search(str(e)):
                     backoff = min(self.base_delay * (2 ** attempt), 60)  # Increased cap to 60 seconds
                     jitter = random.uniform(0.8, 1.2)
                     wait_time = backoff * jitter
@@ -140,8 +208,8 @@ class RateLimitedDuckDuckGoSearch:
 
     def run(self, query: str) -> str:
         """Synchronous run method for compatibility with LangChain tools"""
-        import asyncio
-        return asyncio.run(self.search_with_retry(query))
+        # Runs on the shared loop, so it also works when called from inside a running loop
+        return asyncio.run_coroutine_threadsafe(self.search_with_retry(query), get_search_loop()).result()
 
 async def setup_langchain_agent():
     """Setup a Langchain agent with rate-limited search capabilities"""
@@ -186,6 +254,8 @@ async def main():
     #the idea here is agent in a group working with each other regardless of framework they were built on
     # Get LLM configuration (supports OpenAI or Gemini)
     llm_config = get_llm_config()
+    if LLM_CACHE_ENABLED:
+        enable_llm_cache()
     
     # Create a group chat
     group = HeterogeneousGroupChat(
@@ -205,16 +275,20 @@ async def main():
     
     print("\n=== Creating Agents ===")
     # Create an Autogen-based researcher
+    researcher_llm_config = {
+        "config_list": [{
+            "model": llm_config["model"],
+            "api_key": llm_config["api_key"]
+        }],
+        # AutoGen keys its disk cache on the request, so identical prompts are replayed;
+        # None turns that cache off
+        "cache_seed": AUTOGEN_CACHE_SEED if LLM_CACHE_ENABLED else None
+    }
     researcher = EnhancedMCPAgent(
         name="Researcher",
         system_message="""You are a technology researcher specializing in AI and quantum computing.
         Your role is to analyze topics and provide detailed, technical insights.""",
-        llm_config={
-            "config_list": [{
-                "model": llm_config["model"],
-                "api_key": llm_config["api_key"]
-            }]
-        }
+        llm_config=researcher_llm_config
     )
     
     # Create a Langchain-based analyst with search capabilities
@@ -238,7 +312,13 @@ async def main():
     from agent_mcp.proxy_agent import ProxyAgent
     # Create and add proxy for Influencer
     influencer_proxy = ProxyAgent(name="Influenxers", client_mode=True)
-    await influencer_proxy.connect_to_remote_agent("Influenxers", group.server_url) #Influenxers is the id to Amrit's inflencer agent  
+    email_proxy = ProxyAgent(name="EmailProxy", client_mode=True) 
+    
+    # Both handshakes are independent, so connect the proxies concurrently
+    await asyncio.gather(
+        influencer_proxy.connect_to_remote_agent("Influenxers", group.server_url), #Influenxers is the id to Amrit's inflencer agent  
+        email_proxy.connect_to_remote_agent("EmailAgent", group.server_url)
+    )
     
     # Create a secure agent
     # TODO: come back to do secure connections
@@ -254,10 +334,6 @@ async def main():
     #print(f"Influencer identity: {identity}")
     
     group.add_agent(influencer_proxy)
-
-    # Create and add proxy for EmailAgent
-    email_proxy = ProxyAgent(name="EmailProxy", client_mode=True) 
-    await email_proxy.connect_to_remote_agent("EmailAgent", group.server_url)
     group.add_agent(email_proxy)
     
     # Connect everyone to the deployed server
@@ -266,11 +342,14 @@ async def main():
         await group.connect()
         print("Successfully connected to server")
         
-        # Verify all agents are connected
-        for agent in group.agents:
-            if not agent.transport or not agent.transport.token:
-                raise ValueError(f"Agent {agent.name} not properly connected")
-            print(f"Agent {agent.name} connected with token: {agent.transport.token[:8]}...")
+        # Verify all agents are connected, then report them in one write
+        missing = [agent.name for agent in group.agents if not (agent.transport and agent.transport.token)]
+        if missing:
+            raise ValueError(f"Agents not properly connected: {', '.join(missing)}")
+        print("\n".join(
+            f"Agent {agent.name} connected with token: {agent.transport.token[:8]}..."
+            for agent in group.agents
+        ))
             
         # Verify coordinator connection
         if not group.coordinator or not group.coordinator.transport.token:
@@ -351,8 +430,10 @@ async def main():
     print("\n=== Submitting Task ===")
     print("***** REACHED POINT BEFORE group.submit_task *****", flush=True)
     
-    # Verify task structure before submission
-    print(f"Task structure: {json.dumps(task, indent=2)}")
+    # Verify task structure before submission (only serialized when debug logging is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Task structure: %s", format_json(task))
+    print(f"Task steps: {[step['task_id'] for step in task['steps']]}")
     print(f"Active agents: {[agent.name for agent in group.agents]}")
 
     # Submit all steps at once and let the group chat handle dependency injection at the right time
@@ -366,4 +447,7 @@ async def main():
     print("All agents shut down successfully")
 
 if __name__ == "__main__":
+    # The run is network-I/O bound, so use uvloop's faster event loop when it is installed
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
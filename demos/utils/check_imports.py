@@ -4,22 +4,39 @@ Check Imports for MCPAgent Project.
 This script checks if all required dependencies for the MCPAgent project are available.
 """
 
-import importlib
+import importlib.util
 import sys
+from importlib.metadata import PackageNotFoundError, version
+
+# Top-level module -> distributions providing it, read from installed dist-info
+try:
+    from importlib.metadata import packages_distributions
+    _MODULE_DISTRIBUTIONS = packages_distributions()
+except ImportError:  # Python < 3.10
+    _MODULE_DISTRIBUTIONS = {}
 
 def check_import(module_name, display_name=None):
-    """Check if a module can be imported and print the result."""
+    """Check if a module is installed and print the result.
+    
+    Uses the import system's finder and the installed package metadata, so the
+    module itself is never executed.
+    """
     if display_name is None:
         display_name = module_name
         
-    try:
-        module = importlib.import_module(module_name)
-        version = getattr(module, "__version__", "unknown version")
-        print(f"✓ {display_name} is available (version: {version})")
-        return True
-    except ImportError as e:
-        print(f"✗ {display_name} is NOT available: {e}")
+    if importlib.util.find_spec(module_name) is None:
+        print(f"✗ {display_name} is NOT available: No module named '{module_name}'")
         return False
+    
+    module_version = "unknown version"
+    for distribution in _MODULE_DISTRIBUTIONS.get(module_name, [module_name]):
+        try:
+            module_version = version(distribution)
+            break
+        except PackageNotFoundError:
+            continue
+    print(f"✓ {display_name} is available (version: {module_version})")
+    return True
 
 def main():
     """Check all required imports."""
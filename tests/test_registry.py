@@ -0,0 +1,227 @@
+"""
+Unit tests for the multi-language agent registry
+
+agent_mcp/registry.py is loaded straight from its file so these tests run
+without the optional framework dependencies the package __init__ pulls in.
+"""
+
+import asyncio
+import hmac
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Dict, Any, List
+
+REGISTRY_PATH = Path(__file__).resolve().parent.parent / "agent_mcp" / "registry.py"
+
+def _load_registry():
+    spec = importlib.util.spec_from_file_location("agent_mcp_registry_under_test", REGISTRY_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations through sys.modules
+    spec.loader.exec_module(module)
+    return module
+
+registry = _load_registry()
+
+class InMemoryStorage:
+    """Storage backend keeping documents in lists, recording bulk write sizes"""
+
+    def __init__(self):
+        self.data: Dict[str, List[Dict[str, Any]]] = {}
+        self.batch_sizes: List[int] = []
+
+    async def write(self, collection: str, document: Dict[str, Any]):
+        self.data.setdefault(collection, []).append(dict(document))
+
+    async def write_many(self, collection: str, documents: List[Dict[str, Any]]):
+        self.batch_sizes.append(len(documents))
+        for document in documents:
+            await self.write(collection, document)
+
+    async def query(self, collection: str, filters: Dict[str, Any] = None):
+        documents = self.data.get(collection, [])
+        return [dict(doc) for doc in documents if all(doc.get(k) == v for k, v in (filters or {}).items())]
+
+    async def update(self, collection: str, filters: Dict[str, Any], updates: Dict[str, Any]):
+        for doc in self.data.get(collection, []):
+            if all(doc.get(k) == v for k, v in filters.items()):
+                doc.update(updates)
+
+def _registration(agent_id: str = "agent_a"):
+    return registry.AgentRegistration(
+        agent_id=agent_id,
+        name="Agent A",
+        description="Test agent",
+        language=registry.AgentLanguage.PYTHON,
+        frameworks=["langchain"],
+        protocols=[registry.AgentProtocol.MCP],
+        endpoint="http://localhost:9000"
+    )
+
+def _result(status: str = "healthy", response_time_ms=10.0):
+    return registry.HealthCheckResult(
+        agent_id="agent_a",
+        status=status,
+        response_time_ms=response_time_ms,
+        timestamp="2026-01-01T00:00:00+00:00"
+    )
+
+class TestHealthHistory:
+    """Test the ring-buffer health window and its running totals"""
+
+    def test_totals_before_window_fills(self):
+        history = registry.HealthHistory(maxlen=4)
+        history.append(_result("healthy", 10.0))
+        history.append(_result("unhealthy", 30.0))
+
+        assert len(history) == 2
+        assert history.uptime_percentage == 50.0
+        assert history.average_response_time == 20.0
+
+    def test_oldest_result_retired_when_full(self):
+        history = registry.HealthHistory(maxlen=3)
+        for status, response_time in [("unhealthy", 100.0), ("healthy", 10.0), ("healthy", 20.0), ("healthy", 30.0)]:
+            history.append(_result(status, response_time))
+
+        assert len(history) == 3
+        assert history.uptime_percentage == 100.0
+        assert history.average_response_time == 20.0
+
+    def test_missing_response_times_are_skipped(self):
+        history = registry.HealthHistory(maxlen=2)
+        history.append(_result("unhealthy", None))
+        history.append(_result("healthy", 40.0))
+        assert history.average_response_time == 40.0
+
+        # Retiring the missing measurement must not touch the latency totals
+        history.append(_result("healthy", 20.0))
+        assert history.response_time_count == 2
+        assert history.average_response_time == 30.0
+
+    def test_totals_match_recomputation_over_many_wraps(self):
+        history = registry.HealthHistory(maxlen=7, recent=3)
+        results = [
+            _result("healthy" if i % 3 else "unhealthy", None if i % 5 == 0 else float(i))
+            for i in range(50)
+        ]
+        for result in results:
+            history.append(result)
+
+        window = results[-7:]
+        timed = [r.response_time_ms for r in window if r.response_time_ms is not None]
+        assert history.uptime_percentage == sum(r.status == "healthy" for r in window) / 7 * 100
+        assert abs(history.average_response_time - sum(timed) / len(timed)) < 1e-9
+        assert list(history) == results[-3:]
+
+    def test_empty_history(self):
+        history = registry.HealthHistory()
+        assert len(history) == 0
+        assert history.uptime_percentage == 0.0
+        assert history.average_response_time == 0.0
+
+class TestRegistrationStorage:
+    """Test that registrations are persisted before success is reported"""
+
+    def test_registration_stored_before_loop_exits(self):
+        storage = InMemoryStorage()
+
+        async def run():
+            agents = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+            return await agents.register_agent(_registration(), auto_detect_protocols=False)
+
+        result = asyncio.run(run())
+        assert result["status"] == "success"
+        assert [doc["agent_id"] for doc in storage.data["agent_registrations"]] == ["agent_a"]
+
+    def test_concurrent_registrations_share_batches(self):
+        storage = InMemoryStorage()
+
+        async def run():
+            agents = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+            results = await asyncio.gather(*(
+                agents.register_agent(_registration(f"agent_{i}"), auto_detect_protocols=False)
+                for i in range(10)
+            ))
+            await agents.aclose()
+            return results
+
+        results = asyncio.run(run())
+        assert all(result["status"] == "success" for result in results)
+        assert len(storage.data["agent_registrations"]) == 10
+        assert sum(storage.batch_sizes) == 10
+        assert len(storage.batch_sizes) < 10
+
+    def test_storage_failure_reported(self):
+        class FailingStorage(InMemoryStorage):
+            async def write_many(self, collection, documents):
+                raise IOError("disk full")
+
+        async def run():
+            agents = registry.MultiLanguageAgentRegistry(FailingStorage(), enable_health_monitoring=False)
+            return await agents.register_agent(_registration(), auto_detect_protocols=False)
+
+        result = asyncio.run(run())
+        assert result["status"] == "error"
+        assert "disk full" in result["message"]
+
+    def test_registry_reused_on_second_loop(self):
+        storage = InMemoryStorage()
+        agents = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+
+        for agent_id in ("agent_a", "agent_b"):
+            result = asyncio.run(agents.register_agent(_registration(agent_id), auto_detect_protocols=False))
+            assert result["status"] == "success"
+
+        asyncio.run(asyncio.wait_for(agents.aclose(), timeout=5))
+        assert len(storage.data["agent_registrations"]) == 2
+
+class TestWebhookSecrets:
+    """Test webhook signature verification across registry restarts"""
+
+    def _sign(self, secret: str, payload: Dict[str, Any]) -> str:
+        return hmac.new(secret.encode(), registry._canonical_json(payload), "sha256").hexdigest()
+
+    def test_webhook_verified_after_restart(self):
+        storage = InMemoryStorage()
+        payload = {"event": "health.status", "status": "healthy"}
+
+        async def create():
+            agents = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+            await agents.register_agent(_registration(), auto_detect_protocols=False)
+            return (await agents.create_agent_webhook("agent_a", "http://localhost:9000/hook"))["secret"]
+
+        async def handle(signature):
+            restarted = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+            return await restarted.handle_webhook("agent_a", payload, signature)
+
+        secret = asyncio.run(create())
+        assert asyncio.run(handle(self._sign(secret, payload)))
+        assert not asyncio.run(handle(self._sign("wrong-secret", payload)))
+
+    def test_latest_webhook_secret_wins(self):
+        storage = InMemoryStorage()
+        payload = {"event": "health.status", "status": "healthy"}
+
+        async def run():
+            agents = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+            await agents.register_agent(_registration(), auto_detect_protocols=False)
+            old = (await agents.create_agent_webhook("agent_a", "http://localhost:9000/hook"))["secret"]
+            storage.data["agent_webhooks"][0]["created_at"] = "2000-01-01T00:00:00+00:00"
+            new = (await agents.create_agent_webhook("agent_a", "http://localhost:9000/hook"))["secret"]
+
+            restarted = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+            return (
+                await restarted.handle_webhook("agent_a", payload, self._sign(old, payload)),
+                await restarted.handle_webhook("agent_a", payload, self._sign(new, payload))
+            )
+
+        assert asyncio.run(run()) == (False, True)
+
+    def test_unknown_agent_rejected(self):
+        storage = InMemoryStorage()
+
+        async def run():
+            agents = registry.MultiLanguageAgentRegistry(storage, enable_health_monitoring=False)
+            return await agents.handle_webhook("missing", {"event": "health.status"}, "00")
+
+        assert asyncio.run(run()) is False
@@ -0,0 +1,477 @@
+"""
+Unit tests for the zero-trust security layer
+
+agent_mcp/security.py is loaded straight from its file so these tests run
+without the optional framework dependencies the package __init__ pulls in.
+"""
+
+import asyncio
+import hmac
+import importlib.util
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+SECURITY_PATH = Path(__file__).resolve().parent.parent / "agent_mcp" / "security.py"
+
+def _load_security():
+    spec = importlib.util.spec_from_file_location("agent_mcp_security_under_test", SECURITY_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations through sys.modules
+    spec.loader.exec_module(module)
+    return module
+
+security = _load_security()
+
+SECRET = "test-secret-key-with-at-least-32-bytes"
+
+class InMemoryStorage:
+    """Storage backend keeping documents in lists, matching filters by equality"""
+
+    def __init__(self):
+        self.data: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def write(self, collection: str, document: Dict[str, Any]):
+        self.data.setdefault(collection, []).append(dict(document))
+
+    async def query(self, collection: str, filters: Dict[str, Any] = None):
+        documents = self.data.get(collection, [])
+        filters = {key: value for key, value in (filters or {}).items() if value is not None}
+        return [dict(doc) for doc in documents if all(doc.get(key) == value for key, value in filters.items())]
+
+class TestAuditLogger:
+    """Test audit log buffering across event loops"""
+
+    def test_logged_entries_survive_loop_shutdown(self):
+        """Entries reported as logged are stored before asyncio.run() returns"""
+        storage = InMemoryStorage()
+        layer = security.ZeroTrustSecurityLayer(secret_key=SECRET, storage_backend=storage)
+
+        asyncio.run(layer.create_agent_identity("agent_a", ["tool_usage"]))
+
+        assert len(storage.data["audit_logs"]) == 1
+
+    def test_logger_reused_on_second_loop(self):
+        """A later asyncio.run() gets a fresh writer instead of waiting on the dead loop"""
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+
+        assert asyncio.run(audit.log_action("agent_a", "tool:call"))
+
+        async def second_run():
+            await audit.log_action("agent_a", "tool:call")
+            return await asyncio.wait_for(audit.verify_audit_chain("agent_a"), timeout=5)
+
+        result = asyncio.run(second_run())
+        assert result["verified"], result
+        assert result["total_logs"] == 2
+
+    def test_aclose_writes_fire_and_forget_entries(self):
+        """aclose() drains entries whose callers never awaited the write"""
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+
+        async def run():
+            tasks = [asyncio.ensure_future(audit.log_action("agent_a", "tool:call")) for _ in range(5)]
+            await asyncio.sleep(0)
+            await audit.aclose()
+            assert all(task.done() for task in tasks)
+
+        asyncio.run(run())
+        assert len(storage.data["audit_logs"]) == 5
+
+    def test_backpressure_keeps_chain_order(self):
+        """A full buffer delays callers without reordering or dropping entries"""
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+        audit.max_pending = 4
+        audit.batch_size = 2
+
+        async def run():
+            results = await asyncio.gather(*(audit.log_action("agent_a", f"tool:call{i}") for i in range(20)))
+            assert all(results)
+            return await audit.verify_audit_chain("agent_a")
+
+        result = asyncio.run(run())
+        assert result["verified"], result
+        assert [log["seq"] for log in storage.data["audit_logs"]] == list(range(1, 21))
+
+    def test_restarted_logger_continues_chain(self):
+        """A new logger on the same storage links to the stored chain head"""
+        storage = InMemoryStorage()
+
+        async def log_three():
+            audit = security.AuditLogger(storage, SECRET)
+            audit.checkpoint_interval = 2
+            for _ in range(3):
+                await audit.log_action("agent_a", "tool:call")
+            return audit
+
+        asyncio.run(log_three())
+        restarted = asyncio.run(log_three())
+
+        result = asyncio.run(restarted.verify_audit_chain("agent_a"))
+        assert result["verified"], result
+        assert [log["seq"] for log in storage.data["audit_logs"]] == list(range(1, 7))
+        assert [c["checkpoint_at"] for c in storage.data["audit_checkpoints"]] == [2, 4, 6]
+
+    def test_failed_write_reports_false(self):
+        """log_action() returns False when storage rejects the entry"""
+        class FailingStorage(InMemoryStorage):
+            async def write(self, collection, document):
+                raise IOError("disk full")
+
+        audit = security.AuditLogger(FailingStorage(), SECRET)
+        assert asyncio.run(audit.log_action("agent_a", "tool:call")) is False
+
+class TestAuditChainVerification:
+    """Test checkpointed and range-anchored audit chain verification"""
+
+    def _logged(self, count: int, interval: int = 3):
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+        audit.checkpoint_interval = interval
+
+        async def run():
+            for i in range(count):
+                await audit.log_action("agent_a", f"tool:call{i}")
+
+        asyncio.run(run())
+        return storage, audit
+
+    def test_checkpoints_written_at_interval(self):
+        storage, _ = self._logged(10)
+        checkpoints = storage.data["audit_checkpoints"]
+        assert [c["checkpoint_at"] for c in checkpoints] == [3, 6, 9]
+        by_seq = {log["seq"]: log["hash"] for log in storage.data["audit_logs"]}
+        assert all(by_seq[c["checkpoint_at"]] == c["hash"] for c in checkpoints)
+
+    def test_checkpoints_not_signed_with_jwt_secret(self):
+        """Checkpoints use a key derived from the secret, not the JWT signing secret itself"""
+        storage, _ = self._logged(3)
+        checkpoint = storage.data["audit_checkpoints"][0]
+        message = f"agent_a:3:{checkpoint['hash']}".encode()
+
+        assert checkpoint["signature"] != hmac.digest(SECRET.encode(), message, "sha256").hex()
+        derived = hmac.digest(SECRET.encode(), b"audit-checkpoint", "sha256")
+        assert checkpoint["signature"] == hmac.digest(derived, message, "sha256").hex()
+
+    def test_range_verification_hashes_between_checkpoints(self):
+        """Only entries between the bracketing checkpoints are verified"""
+        storage, audit = self._logged(10)
+
+        result = asyncio.run(audit.verify_audit_chain("agent_a", start_seq=5, end_seq=7))
+        assert result["verified"], result
+        assert result["total_logs"] == 6  # seq 4..9, anchored on the checkpoint at 3
+        assert result["checkpoints"] == 3
+
+    def test_range_verification_ignores_tampering_outside_range(self):
+        storage, audit = self._logged(10)
+        storage.data["audit_logs"][0]["result"] = "tampered"
+
+        assert asyncio.run(audit.verify_audit_chain("agent_a", start_seq=5, end_seq=7))["verified"]
+        full = asyncio.run(audit.verify_audit_chain("agent_a"))
+        assert not full["verified"]
+        assert full["verification_errors"] == ["Hash mismatch at index 0"]
+
+    def test_range_verification_detects_tampering_inside_range(self):
+        storage, audit = self._logged(10)
+        storage.data["audit_logs"][5]["result"] = "tampered"
+
+        result = asyncio.run(audit.verify_audit_chain("agent_a", start_seq=5, end_seq=7))
+        assert not result["verified"]
+
+    def test_forged_checkpoint_is_rejected(self):
+        storage, audit = self._logged(10)
+        storage.data["audit_checkpoints"][0]["signature"] = "0" * 64
+
+        result = asyncio.run(audit.verify_audit_chain("agent_a"))
+        assert not result["verified"]
+        assert "Invalid checkpoint signature at seq 3" in result["verification_errors"]
+
+    def test_unordered_storage_results_are_sorted_by_seq(self):
+        storage, audit = self._logged(7)
+        storage.data["audit_logs"].reverse()
+
+        result = asyncio.run(audit.verify_audit_chain("agent_a", start_seq=2, end_seq=5))
+        assert result["verified"], result
+        assert result["total_logs"] == 6  # seq 1..6: no checkpoint before 2, closing one at 6
+
+class TestRateLimiter:
+    """Test rate limit results and window accounting"""
+
+    def test_result_is_plain_dict_with_reset_time(self):
+        limiter = security.RateLimiter()
+        limiter.set_rate_limit("tool:call", 2, 60)
+
+        result = limiter.check_rate_limit("agent_a", "tool:call")
+        assert type(result) is dict
+        assert set(result) == {"allowed", "remaining", "reset_time", "limit", "window"}
+        assert json.loads(json.dumps(result))["reset_time"] == result["reset_time"]
+        datetime.fromisoformat(result["reset_time"])
+
+    def test_limit_enforced_within_window(self):
+        limiter = security.RateLimiter()
+        limiter.set_rate_limit("tool:call", 2, 60)
+
+        results = [limiter.check_rate_limit("agent_a", "tool:call") for _ in range(3)]
+        assert [r["allowed"] for r in results] == [True, True, False]
+        assert [r["remaining"] for r in results] == [1, 0, 0]
+        assert "reset_time" in results[2]
+        assert limiter.check_rate_limit("agent_b", "tool:call")["allowed"]
+
+def _identity(capabilities=("tool_usage",), level=None):
+    manager = security.DecentralizedIdentityManager(secret_key=SECRET)
+    return manager.create_identity(
+        agent_id="agent_a",
+        capabilities=list(capabilities),
+        security_level=level or security.SecurityLevel.MEDIUM
+    )
+
+class TestTokenCache:
+    """Test the decoded-payload LRU in ZeroTrustAuthorizer.verify_token"""
+
+    def test_repeat_verification_skips_decode(self, monkeypatch):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        token = authorizer.create_scoped_token(_identity(), [security.Permission.CALL_TOOL])
+
+        decode_calls = []
+        real_decode = security.jwt.decode
+        monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: decode_calls.append(1) or real_decode(*a, **kw))
+
+        first = authorizer.verify_token(token)
+        second = authorizer.verify_token(token)
+        assert first == second and first["agent_id"] == "agent_a"
+        assert len(decode_calls) == 1
+        assert token.encode() not in authorizer.token_cache  # keyed by digest, not the raw token
+
+    def test_mutating_result_does_not_change_cache(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        token = authorizer.create_scoped_token(_identity(), [security.Permission.CALL_TOOL])
+
+        payload = authorizer.verify_token(token)
+        payload["agent_id"] = "attacker"
+        payload["permissions"].clear()
+        payload["context"]["target"] = "anything"
+
+        again = authorizer.verify_token(token)
+        assert again["agent_id"] == "agent_a"
+        assert again["permissions"] == ["tool:call"]
+        assert again["context"] == {}
+
+    def test_revoked_session_rejected_from_cache(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        token = authorizer.create_scoped_token(_identity(), [security.Permission.CALL_TOOL])
+        assert authorizer.verify_token(token)
+
+        assert authorizer.revoke_agent_sessions("agent_a") == 1
+        assert authorizer.verify_token(token) is None
+
+    def test_revoke_token_drops_cache_entry(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        token = authorizer.create_scoped_token(_identity(), [security.Permission.CALL_TOOL])
+        authorizer.verify_token(token)
+
+        assert authorizer.revoke_token(token)
+        assert not authorizer.token_cache
+        assert authorizer.verify_token(token) is None
+
+    def test_expired_cached_token_is_evicted(self, monkeypatch):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        token = authorizer.create_scoped_token(_identity(), [security.Permission.CALL_TOOL], ttl_minutes=1)
+        assert authorizer.verify_token(token)
+
+        later = security.time.time() + 120
+        monkeypatch.setattr(security.time, "time", lambda: later)
+        assert authorizer.verify_token(token) is None
+        assert not authorizer.token_cache
+
+    def test_cache_is_bounded_lru(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        authorizer.token_cache_size = 2
+        identity = _identity()
+        tokens = [authorizer.create_scoped_token(identity, [security.Permission.CALL_TOOL]) for _ in range(3)]
+
+        authorizer.verify_token(tokens[0])
+        authorizer.verify_token(tokens[1])
+        authorizer.verify_token(tokens[0])  # most recently used again
+        authorizer.verify_token(tokens[2])
+
+        keys = list(authorizer.token_cache)
+        assert keys == [authorizer._token_cache_key(tokens[0]), authorizer._token_cache_key(tokens[2])]
+
+class TestDecisionCache:
+    """Test cached identity/target authorization decisions"""
+
+    def _counting(self, authorizer, monkeypatch):
+        calls = []
+        real = authorizer._evaluate_identity_and_target
+        monkeypatch.setattr(authorizer, "_evaluate_identity_and_target", lambda *a: calls.append(a) or real(*a))
+        return calls
+
+    def test_repeat_decision_is_cached(self, monkeypatch):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        calls = self._counting(authorizer, monkeypatch)
+        identity = _identity()
+
+        for _ in range(3):
+            assert authorizer.check_authorization(identity, "tool:call", {"target": "search"})["allowed"]
+        assert len(calls) == 1
+
+    def test_cached_denial_is_returned_as_copy(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        identity = _identity(capabilities=())
+
+        denial = authorizer.check_authorization(identity, "tool:call", {})
+        denial["allowed"] = True
+        assert authorizer.check_authorization(identity, "tool:call", {})["allowed"] is False
+
+    def test_value_limits_checked_on_cache_hit(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        identity = _identity()
+
+        assert authorizer.check_authorization(identity, "tool:call", {"value": 1})["allowed"]
+        assert not authorizer.check_authorization(identity, "tool:call", {"value": 1000})["allowed"]
+
+    def test_add_policy_invalidates(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        identity = _identity()
+        assert authorizer.check_authorization(identity, "tool:call", {})["allowed"]
+
+        authorizer.add_policy(security.AccessPolicy(
+            name="tool_access",
+            required_capabilities=["admin_access"],
+            required_permissions=[security.Permission.CALL_TOOL]
+        ))
+        assert not authorizer.check_authorization(identity, "tool:call", {})["allowed"]
+
+    def test_expired_decision_is_reevaluated(self, monkeypatch):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        authorizer.decision_cache_ttl = 0
+        calls = self._counting(authorizer, monkeypatch)
+        identity = _identity()
+
+        authorizer.check_authorization(identity, "tool:call", {})
+        authorizer.check_authorization(identity, "tool:call", {})
+        assert len(calls) == 2
+
+    def test_unhashable_target_is_not_cached(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        assert authorizer.check_authorization(_identity(), "tool:call", {"target": ["a", "b"]})["allowed"]
+        assert not authorizer.decision_cache
+
+    def test_cache_is_bounded(self):
+        authorizer = security.ZeroTrustAuthorizer(SECRET)
+        authorizer.decision_cache_size = 2
+        identity = _identity()
+        for target in ("a", "b", "c"):
+            authorizer.check_authorization(identity, "tool:call", {"target": target})
+        assert [key[3] for key in authorizer.decision_cache] == ["b", "c"]
+
+class TestPasswordVerifier:
+    """Test the bcrypt verification LRU"""
+
+    HASHED = security.bcrypt.hashpw(b"correct horse", security.bcrypt.gensalt(rounds=4))
+
+    def _counting(self, monkeypatch):
+        calls = []
+        real = security.bcrypt.checkpw
+        monkeypatch.setattr(security.bcrypt, "checkpw", lambda *a: calls.append(a) or real(*a))
+        return calls
+
+    def test_results_are_cached(self, monkeypatch):
+        verifier = security.PasswordVerifier()
+        calls = self._counting(monkeypatch)
+
+        assert verifier.verify("correct horse", self.HASHED)
+        assert verifier.verify(b"correct horse", self.HASHED.decode())
+        assert not verifier.verify("wrong", self.HASHED)
+        assert not verifier.verify("wrong", self.HASHED)
+        assert len(calls) == 2
+
+    def test_cache_keys_are_keyed_per_instance(self):
+        verifier = security.PasswordVerifier()
+        verifier.verify("correct horse", self.HASHED)
+        other = security.PasswordVerifier()
+        other.verify("correct horse", self.HASHED)
+        assert list(verifier._cache) != list(other._cache)
+
+    def test_malformed_hash_is_rejected(self):
+        assert security.PasswordVerifier().verify("anything", "not-a-bcrypt-hash") is False
+
+    def test_expired_result_is_rechecked(self, monkeypatch):
+        verifier = security.PasswordVerifier(ttl_seconds=0)
+        calls = self._counting(monkeypatch)
+        verifier.verify("correct horse", self.HASHED)
+        verifier.verify("correct horse", self.HASHED)
+        assert len(calls) == 2
+
+    def test_cache_is_bounded_and_invalidated(self):
+        verifier = security.PasswordVerifier(max_entries=2)
+        for guess in ("a", "b", "c"):
+            verifier.verify(guess, self.HASHED)
+        assert len(verifier._cache) == 2
+
+        verifier.invalidate()
+        assert not verifier._cache
+
+class TestSampledAuditLogging:
+    """Test aggregation of high-volume audit actions"""
+
+    def test_repeats_are_aggregated(self):
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+
+        async def run():
+            for _ in range(10):
+                assert await audit.log_action_sampled("agent_a", "auth:failed", sample_rate=0.25,
+                                                      context={"reason": "invalid_token"})
+            await audit.flush()
+
+        asyncio.run(run())
+        counts = [log["metadata"].get("count") for log in storage.data["audit_logs"]]
+        assert counts == [None, 4, 4, 1]
+
+    def test_window_close_writes_remaining_repeats(self):
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+        audit.sample_window = 0.01
+
+        async def run():
+            for _ in range(3):
+                await audit.log_action_sampled("agent_a", "auth:failed", context={"reason": "invalid_token"})
+            await asyncio.sleep(0.05)
+            await audit.aclose()
+
+        asyncio.run(run())
+        counts = [log["metadata"].get("count") for log in storage.data["audit_logs"]]
+        assert counts == [None, 2]
+
+    def test_distinct_reasons_sampled_separately(self):
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+
+        async def run():
+            await audit.log_action_sampled("agent_a", "auth:failed", context={"reason": "invalid_token"})
+            await audit.log_action_sampled("agent_a", "auth:failed", context={"reason": "malformed_token"})
+
+        asyncio.run(run())
+        assert [log["metadata"]["reason"] for log in storage.data["audit_logs"]] == ["invalid_token", "malformed_token"]
+
+    def test_window_restarts_on_next_loop(self):
+        """A window whose loop closed is written and restarted by the next loop"""
+        storage = InMemoryStorage()
+        audit = security.AuditLogger(storage, SECRET)
+        audit.sample_window = 60.0  # outlives the first asyncio.run()
+
+        async def log_failures(times):
+            for _ in range(times):
+                await audit.log_action_sampled("agent_a", "auth:failed", context={"reason": "invalid_token"})
+
+        asyncio.run(log_failures(3))
+        asyncio.run(log_failures(1))
+
+        counts = [log["metadata"].get("count") for log in storage.data["audit_logs"]]
+        assert counts == [None, 2, None]